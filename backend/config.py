@@ -2,40 +2,67 @@
 Configuration module for the Legal Document Assistant backend.
 """
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
 
-
-class Config:
+@dataclass(frozen=True)
+class AppConfig:
     """Application configuration."""
 
     # Gemini API
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-    # GEMINI_MODEL = 'gemini-2.5-flash'
-    GEMINI_MODEL = 'gemini-3-pro-preview'
+    GEMINI_API_KEY: Optional[str]
+    GEMINI_MODEL: str
 
     # Flask
-    FLASK_ENV = os.getenv('FLASK_ENV', 'development')
-    FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    FLASK_ENV: str
+    FLASK_DEBUG: bool
 
     # Server
-    HOST = os.getenv('HOST', '0.0.0.0')
-    PORT = int(os.getenv('FLASK_RUN_PORT', 5001))
+    HOST: str
+    PORT: int
 
     # CORS
-    CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
+    CORS_ORIGINS: str
 
-    @staticmethod
-    def validate():
+    def validate(self):
         """Validate required configuration."""
-        if not Config.GEMINI_API_KEY:
+        if not self.GEMINI_API_KEY:
             raise ValueError(
                 "GEMINI_API_KEY is not set. "
                 "Please set it in your .env file or environment variables."
             )
 
 
-# Validate configuration on import
-Config.validate()
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """
+    Load and validate configuration from the environment.
+
+    The .env file and environment variables are read exactly once; later
+    calls return the same frozen instance.
+
+    Returns:
+        Validated application configuration
+    """
+    # Load environment variables
+    load_dotenv()
+
+    config = AppConfig(
+        GEMINI_API_KEY=os.getenv('GEMINI_API_KEY'),
+        # GEMINI_MODEL='gemini-2.5-flash',
+        GEMINI_MODEL='gemini-3-pro-preview',
+        FLASK_ENV=os.getenv('FLASK_ENV', 'development'),
+        FLASK_DEBUG=os.getenv('FLASK_DEBUG', 'True').lower() == 'true',
+        HOST=os.getenv('HOST', '0.0.0.0'),
+        PORT=int(os.getenv('FLASK_RUN_PORT', 5001)),
+        CORS_ORIGINS=os.getenv('CORS_ORIGINS', '*'),
+    )
+    config.validate()
+    return config
+
+
+# Validate configuration on import; kept under the old name for existing imports
+Config = get_config()
@@ -1,6 +1,6 @@
 """
 Models package for data structures and schemas.
 """
-from .schemas import FUNCTION_TOOLS
+from .schemas import FUNCTION_TOOLS, FUNCTION_TOOLS_COMPILED
 
-__all__ = ['FUNCTION_TOOLS']
+__all__ = ['FUNCTION_TOOLS', 'FUNCTION_TOOLS_COMPILED']
@@ -1,6 +1,7 @@
 """
 Function schemas and data models for Gemini function calling.
 """
+from google.generativeai.types import FunctionLibrary
 
 # Define function declarations for Gemini
 FUNCTION_TOOLS = [
@@ -65,7 +66,7 @@ Examples:
                     "properties": {
                         "edit_type": {
                             "type": "string",
-                            "description": "Type of edit (e.g., 'update_field', 'replace_section', 'add_clause')"
+                            "description": "Type of edit: 'update_field' (set a field), 'add_section' (add a section to a custom document) or 'remove_section' (remove a section by heading)"
                         },
                         "field_name": {
                             "type": "string",
@@ -94,3 +95,7 @@ Examples:
         ]
     }
 ]
+
+# Pre-converted protobuf form of FUNCTION_TOOLS, built once at import so the
+# SDK does not re-walk the dict schema whenever a model is constructed
+FUNCTION_TOOLS_COMPILED = FunctionLibrary(tools=FUNCTION_TOOLS)
@@ -1,6 +1,6 @@
 """
 Prompts package for system prompts and prompt templates.
 """
-from .system_prompt import SYSTEM_PROMPT
+from .system_prompt import SYSTEM_PROMPT, SYSTEM_INSTRUCTION
 
-__all__ = ['SYSTEM_PROMPT']
+__all__ = ['SYSTEM_PROMPT', 'SYSTEM_INSTRUCTION']
@@ -3,6 +3,7 @@ System prompt for the legal document assistant.
 This prompt has been iteratively refined for optimal performance.
 See PROMPT_ENGINEERING.md in the root directory for detailed documentation.
 """
+from google.generativeai.types import content_types
 
 SYSTEM_PROMPT = """You are an expert legal document assistant AI designed to help users create professional legal documents through conversational interaction.
 
@@ -45,7 +46,7 @@ SYSTEM_PROMPT = """You are an expert legal document assistant AI designed to hel
 - Use when user requests changes to an existing document
 - The document will be regenerated as a PDF with the changes applied
 - Specify exactly what is being changed and why
-- Examples of edit types:
+- Supported edit types (no others are accepted):
   * 'update_field': Change a specific value (date, name, amount)
   * 'add_section': Add a new section to the document
   * 'remove_section': Remove a section from the document
@@ -78,3 +79,6 @@ SYSTEM_PROMPT = """You are an expert legal document assistant AI designed to hel
 - When generating documents, ensure they are complete and professional
 
 Remember: You're helping users create legal documents efficiently while ensuring accuracy and completeness."""
+
+# Protobuf Content form of the prompt, built once so the SDK can use it as-is
+SYSTEM_INSTRUCTION = content_types.to_content(SYSTEM_PROMPT)
@@ -1,28 +1,75 @@
 """
 Chat API routes with SSE streaming support.
 """
-import json
-import base64
+from __future__ import annotations
+
 from typing import Any
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Blueprint, Response, request, stream_with_context
 import google.generativeai as genai
+import orjson
 from google.generativeai.types import GenerationConfig
 from google.protobuf import json_format
 from google.protobuf.message import Message as ProtobufMessage
+from google.protobuf.struct_pb2 import ListValue, Struct, Value
+from proto.marshal.collections.repeated import Repeated
 
-from config import Config
-from models import FUNCTION_TOOLS
-from prompts import SYSTEM_PROMPT
+from config import get_config
+from models import FUNCTION_TOOLS_COMPILED
+from prompts import SYSTEM_INSTRUCTION
 from services import DocumentService, conversation_service
-from utils import create_sse_response
+from utils import create_sse_response, sse_text, sse_done, sse_error, gzip_stream, threaded_stream
 
 
 # Create blueprint
 chat_bp = Blueprint('chat', __name__)
 
+# Resolve configuration once for this module
+CFG = get_config()
+
 # Configure Gemini
-genai.configure(api_key=Config.GEMINI_API_KEY)
+genai.configure(api_key=CFG.GEMINI_API_KEY)
+
+# Worker pool that runs each chat turn while the request thread only writes frames
+_STREAM_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix='chat-stream')
+
+# Build the model once; it holds no per-conversation state and is safe to share
+_MODEL = genai.GenerativeModel(
+    model_name=CFG.GEMINI_MODEL,
+    tools=FUNCTION_TOOLS_COMPILED,
+    system_instruction=SYSTEM_INSTRUCTION,
+    generation_config=GenerationConfig(
+        temperature=0.0
+    )
+)
+
+
+def _value_to_py(value: Value) -> Any:
+    """Read a protobuf Value by its populated oneof field."""
+    kind = value.WhichOneof('kind')
+    if kind == 'string_value':
+        return value.string_value
+    if kind == 'number_value':
+        return value.number_value
+    if kind == 'bool_value':
+        return value.bool_value
+    if kind == 'struct_value':
+        return _struct_to_py(value.struct_value)
+    if kind == 'list_value':
+        return _list_value_to_py(value.list_value)
+    # null_value or unset
+    return None
+
+
+def _struct_to_py(struct: Struct) -> dict:
+    """Convert a protobuf Struct by walking its fields directly."""
+    return {key: _value_to_py(value) for key, value in struct.fields.items()}
+
+
+def _list_value_to_py(list_value: ListValue) -> list:
+    """Convert a protobuf ListValue by walking its values directly."""
+    return [_value_to_py(value) for value in list_value.values]
 
 
 def convert_to_serializable(obj: Any, depth: int = 0, max_depth: int = 20, visited: set = None) -> Any:
@@ -66,8 +113,8 @@ def convert_to_serializable(obj: Any, depth: int = 0, max_depth: int = 20, visit
         if isinstance(obj, ProtobufMessage):
             return json_format.MessageToDict(obj)
         
-        # Handle lists and tuples
-        if isinstance(obj, (list, tuple)):
+        # Handle lists, tuples and proto-plus repeated fields
+        if isinstance(obj, (list, tuple, Repeated)):
             return [convert_to_serializable(item, depth + 1, max_depth, visited) for item in obj]
 
         # Handle regular dicts
@@ -124,143 +171,150 @@ def chat():
     Request JSON:
         {
             "message": "User message",
-            "conversation_id": "optional-uuid"
+            "conversation_id": "optional-uuid",
+            "inline_pdf": false
         }
 
     Response: SSE stream with events:
         - type: text - Text chunk
         - type: function_call - Function being called
-        - type: document - Generated/updated document
+        - type: document - Generated/updated document (PDF URLs; base64 too if inline_pdf)
         - type: done - Conversation complete
         - type: error - Error occurred
     """
-    data = request.json
+    try:
+        data = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        return {'error': 'Request body must be a JSON object'}, 400
+
     user_message = data.get('message', '')
     conversation_id = data.get('conversation_id')
+    inline_pdf = bool(data.get('inline_pdf'))
 
     # Create new conversation if needed
     if not conversation_id or not conversation_service.conversation_exists(conversation_id):
         conversation_id = conversation_service.create_conversation()
 
-    # Add user message to history
-    conversation_service.add_message(conversation_id, 'user', user_message)
-
     def generate():
         """Generator function for SSE streaming."""
+        # Turns on one conversation share a chat session, so they run one at a time
+        with conversation_service.turn_lock(conversation_id):
+            yield from run_turn()
+
+    def run_turn():
+        """Run one chat turn while holding the conversation's turn lock."""
+        # Set once the turn is stored; any other exit, including the client
+        # disconnecting (GeneratorExit), leaves the cached session suspect
+        completed = False
         try:
-            # Initialize Gemini model
-            model = genai.GenerativeModel(
-                model_name=Config.GEMINI_MODEL,
-                tools=FUNCTION_TOOLS,
-                system_instruction=SYSTEM_PROMPT,
-                generation_config=GenerationConfig(
-                    temperature=0.0
+            # Add user message to history
+            conversation_service.add_message(conversation_id, 'user', user_message)
+
+            # Reuse the shared Gemini model
+            model = _MODEL
+
+            # Reuse the live chat session; only on a miss is it rebuilt from
+            # the stored history (excluding the current message)
+            chat_session = conversation_service.get_or_create_session(
+                conversation_id,
+                lambda: model.start_chat(
+                    history=conversation_service.get_history(conversation_id, exclude_last=True)
                 )
             )
 
-            # Get conversation history (exclude the current message)
-            history = conversation_service.get_history(conversation_id)[:-1]
-
-            # Create chat session
-            chat_session = model.start_chat(history=history)
-
             # Send message and stream response
             response = chat_session.send_message(user_message, stream=True)
 
-            accumulated_text = ""
-            
+            # Text chunks are joined once at the end instead of concatenated per chunk
+            accumulated_parts = []
+
             # Loop to handle chained function calls (e.g. get_date -> generate_document)
             while True:
-                function_calls = []
+                # Function results are collected for one batched reply to the model
+                function_response_parts = []
 
-                # Process streaming response
+                # Process streaming response, executing function calls as they arrive
                 for chunk in response:
-                    if chunk.candidates[0].content.parts:
-                        for part in chunk.candidates[0].content.parts:
-                            # Handle function calls
-                            if hasattr(part, 'function_call') and part.function_call:
-                                function_calls.append(part.function_call)
+                    # Resolve the candidate's parts once per chunk
+                    candidates = chunk.candidates
+                    if not candidates:
+                        continue
+                    parts = candidates[0].content.parts
+                    if parts:
+                        for part in parts:
+                            function_call = getattr(part, 'function_call', None)
+                            # Handle function calls; an unset field is an empty default
+                            # message, which the name check rejects without computing
+                            # the message's full truth value
+                            if function_call is not None and function_call.name:
+                                yield from _run_function_call(
+                                    conversation_id,
+                                    function_call,
+                                    function_response_parts,
+                                    inline_pdf
+                                )
+                                continue
+
                             # Handle text
-                            elif hasattr(part, 'text') and part.text:
-                                accumulated_text += part.text
-                                yield create_sse_response('text', {'content': part.text})
+                            text = getattr(part, 'text', None)
+                            if text:
+                                accumulated_parts.append(text)
+                                # Frames that queue up while the socket is busy are
+                                # sent in one write by threaded_stream
+                                yield sse_text(text)
 
                 # If no function calls, we are done with this turn
-                if not function_calls:
+                if not function_response_parts:
                     break
 
-                # Prepare function responses
-                function_response_parts = []
-
-                for func_call in function_calls:
-                    func_name = func_call.name
-                    # Convert args to JSON-serializable format
-                    func_args = convert_to_serializable(func_call.args)
-
-                    # Validate that func_args is a dict before using
-                    if not isinstance(func_args, dict):
-                        func_args = {}
-
-                    # Notify frontend about function call
-                    yield create_sse_response('function_call', {
-                        'function': func_name,
-                        'args': func_args
-                    })
-
-                    # Execute function
-                    function_result = execute_function(
-                        conversation_id,
-                        func_name,
-                        func_args
-                    )
-
-                    # Yield document if generated (PDF as base64)
-                    if function_result.get('pdf_base64'):
-                        yield create_sse_response('document', {
-                            'pdf_base64': function_result.get('pdf_base64_preview', function_result['pdf_base64']),
-                            'pdf_base64_download': function_result.get('pdf_base64_download', function_result['pdf_base64']),
-                            'changes': function_result.get('changes')
-                        })
-
-                    # Add to response parts
-                    function_response_parts.append({
-                        'function_response': {
-                            'name': func_name,
-                            'response': function_result
-                        }
-                    })
-
                 # Send all function results back to the model
                 response = chat_session.send_message({
                     'role': 'function',
                     'parts': function_response_parts
                 }, stream=True)
-                
+
                 # The loop will now process the model's response to these function results
 
             # Store assistant response
-            if accumulated_text:
+            if accumulated_parts:
                 conversation_service.add_message(
                     conversation_id,
                     'model',
-                    accumulated_text
+                    ''.join(accumulated_parts)
                 )
 
             # Send completion
-            yield create_sse_response('done', {'conversation_id': conversation_id})
+            completed = True
+            yield sse_done(conversation_id)
 
         except Exception as e:
             error_msg = f"Error processing message: {str(e)}. Please try again or check your connection."
-            yield create_sse_response('error', {'content': error_msg})
+            yield sse_error(error_msg)
+
+        finally:
+            if not completed:
+                # The session may hold a half-finished turn; rebuild it next time
+                conversation_service.drop_session(conversation_id)
+
+    stream = stream_with_context(threaded_stream(generate(), _STREAM_POOL))
+    headers = {
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+        'Connection': 'keep-alive'
+    }
+
+    # Compress the stream when the client accepts gzip
+    if request.accept_encodings['gzip'] > 0:
+        stream = gzip_stream(stream)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
 
     return Response(
-        stream_with_context(generate()),
+        stream,
         mimetype='text/event-stream',
-        headers={
-            'Cache-Control': 'no-cache',
-            'X-Accel-Buffering': 'no',
-            'Connection': 'keep-alive'
-        }
+        headers=headers
     )
 
 
@@ -282,6 +336,33 @@ def get_conversation(conversation_id):
     return {'error': 'Conversation not found'}, 404
 
 
+@chat_bp.route('/conversations/<conversation_id>/pdf/<int:version>', methods=['GET'])
+def get_document_pdf(conversation_id, version):
+    """
+    Get a rendered PDF for a document version.
+
+    Args:
+        conversation_id: Conversation ID
+        version: Document version from the document SSE event
+
+    Query parameters:
+        variant: 'preview' (default, with edit highlights) or 'download'
+
+    Returns:
+        PDF bytes or 404 error
+    """
+    download = request.args.get('variant') == 'download'
+    pdf_bytes = conversation_service.get_document_pdf(conversation_id, version, download=download)
+
+    if pdf_bytes is None:
+        return {'error': 'Document not found'}, 404
+    return Response(
+        pdf_bytes,
+        mimetype='application/pdf',
+        headers={'Cache-Control': 'private, max-age=3600'}
+    )
+
+
 @chat_bp.route('/conversations/<conversation_id>', methods=['DELETE'])
 def delete_conversation(conversation_id):
     """
@@ -298,107 +379,196 @@ def delete_conversation(conversation_id):
     return {'error': 'Conversation not found'}, 404
 
 
-def execute_function(conversation_id: str, func_name: str, func_args: dict) -> dict:
+def _run_function_call(
+    conversation_id: str,
+    func_call: Any,
+    function_response_parts: list,
+    inline_pdf: bool = False
+):
     """
-    Execute a function call from the LLM.
+    Execute a single function call and stream its SSE events.
 
     Args:
         conversation_id: Conversation ID
-        func_name: Function name
-        func_args: Function arguments
+        func_call: FunctionCall part received from the model
+        function_response_parts: List the function response part is appended to
+        inline_pdf: Also embed the PDFs as base64 in document events
 
-    Returns:
-        Function result dictionary
+    Yields:
+        SSE messages for the function call and any resulting document
     """
-    if func_name == 'extract_information':
-        # Store extracted information
+    func_name = func_call.name
+    # Convert args to JSON-serializable format; the raw protobuf
+    # Struct is walked directly, the generic walker is the fallback
+    if hasattr(func_call, '_pb'):
+        func_args = _struct_to_py(func_call._pb.args)
+    else:
+        func_args = convert_to_serializable(func_call.args)
+
+    # Validate that func_args is a dict before using
+    if not isinstance(func_args, dict):
+        func_args = {}
+
+    # Notify frontend about function call
+    yield create_sse_response('function_call', {
+        'function': func_name,
+        'args': func_args
+    })
+
+    # Execute function
+    function_result = execute_function(
+        conversation_id,
+        func_name,
+        func_args
+    )
+
+    # Yield document if generated; the PDFs themselves are fetched by URL
+    doc_version = function_result.get('doc_version')
+    if doc_version:
+        pdf_url = f'/conversations/{conversation_id}/pdf/{doc_version}'
+        event = {
+            'doc_version': doc_version,
+            'pdf_url': pdf_url,
+            'pdf_download_url': f'{pdf_url}?variant=download',
+            'changes': function_result.get('changes')
+        }
+        if inline_pdf:
+            # Legacy clients that expect base64 in the event
+            preview_base64 = conversation_service.get_document_base64(conversation_id, doc_version)
+            download_base64 = conversation_service.get_document_base64(
+                conversation_id, doc_version, download=True
+            )
+            event['pdf_base64'] = preview_base64
+            # A freshly generated document has no highlights, so preview and
+            # download are the same PDF; clients fall back to pdf_base64
+            if download_base64 is not preview_base64:
+                event['pdf_base64_download'] = download_base64
+        yield create_sse_response('document', event)
+
+    # Add to response parts
+    function_response_parts.append({
+        'function_response': {
+            'name': func_name,
+            'response': function_result
+        }
+    })
+
+
+def _handle_extract(conversation_id: str, func_args: dict) -> dict:
+    """Handle extract_information by echoing the structured data back."""
+    # Store extracted information
+    return {
+        'status': 'success',
+        'message': 'Information extracted successfully',
+        'data': func_args
+    }
+
+
+def _handle_generate(conversation_id: str, func_args: dict) -> dict:
+    """Handle generate_document by rendering and storing a new PDF."""
+    doc_type = func_args.get('document_type', '')
+    doc_data = func_args.get('document_data', {})
+
+    try:
+        # Generate document (returns PDF bytes and document data)
+        pdf_bytes, doc_data_dict = DocumentService.generate(doc_type, doc_data)
+
+        # Store document
+        doc_version = conversation_service.set_document(conversation_id, pdf_bytes, doc_data_dict)
+
         return {
             'status': 'success',
-            'message': 'Information extracted successfully',
-            'data': func_args
+            'message': 'Document generated successfully',
+            'doc_version': doc_version
+        }
+    except ValueError as e:
+        return {
+            'status': 'error',
+            'message': str(e)
         }
 
-    elif func_name == 'generate_document':
-        doc_type = func_args.get('document_type', '')
-        doc_data = func_args.get('document_data', {})
 
-        try:
-            # Generate document (returns PDF bytes and document data)
-            pdf_bytes, doc_data_dict = DocumentService.generate(doc_type, doc_data)
-
-            # Store document
-            conversation_service.set_document(conversation_id, pdf_bytes, doc_data_dict)
-
-            # Convert PDF to base64 for transmission
-            pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-
-            return {
-                'status': 'success',
-                'message': 'Document generated successfully',
-                'pdf_base64': pdf_base64,
-                'pdf_base64_preview': pdf_base64,
-                'pdf_base64_download': pdf_base64
-            }
-        except ValueError as e:
-            return {
-                'status': 'error',
-                'message': str(e)
-            }
-
-    elif func_name == 'apply_edits':
-        # Get current document data (not the PDF)
-        doc_data = conversation_service.get_document_data(conversation_id)
-
-        if doc_data:
-            edit_type = func_args.get('edit_type', '')
-            field_name = func_args.get('field_name', '')
-            new_value = func_args.get('new_value', '')
+def _handle_edits(conversation_id: str, func_args: dict) -> dict:
+    """Handle apply_edits by editing the stored document and re-rendering it."""
+    # Get current document data (not the PDF)
+    doc_data = conversation_service.get_document_data(conversation_id)
 
-            try:
-                # Apply edit and regenerate PDF
-                pdf_preview, pdf_download, updated_doc_data, changes = DocumentService.apply_edit(
-                    doc_data,
-                    edit_type,
-                    field_name,
-                    new_value
-                )
+    if not doc_data:
+        return {
+            'status': 'error',
+            'message': 'No document exists to edit. Please generate a document first.'
+        }
+
+    edit_type = func_args.get('edit_type', '')
+    field_name = func_args.get('field_name', '')
+    new_value = func_args.get('new_value', '')
+
+    try:
+        # Apply edit and regenerate PDF
+        pdf_preview, pdf_download, updated_doc_data, changes = DocumentService.apply_edit(
+            doc_data,
+            edit_type,
+            field_name,
+            new_value
+        )
+
+        # Store updated document (store the download version as the "official" one)
+        doc_version = conversation_service.set_document(
+            conversation_id,
+            pdf_download,
+            updated_doc_data,
+            preview_bytes=pdf_preview
+        )
 
-                # Store updated document (store the download version as the "official" one)
-                conversation_service.set_document(conversation_id, pdf_download, updated_doc_data)
-
-                # Convert PDF to base64 for transmission
-                pdf_base64_preview = base64.b64encode(pdf_preview).decode('utf-8')
-                pdf_base64_download = base64.b64encode(pdf_download).decode('utf-8')
-
-                return {
-                    'status': 'success',
-                    'message': f'Document updated: {changes}',
-                    'changes': changes,
-                    'pdf_base64': pdf_base64_preview, # Legacy support if needed
-                    'pdf_base64_preview': pdf_base64_preview,
-                    'pdf_base64_download': pdf_base64_download
-                }
-            except ValueError as e:
-                return {
-                    'status': 'error',
-                    'message': str(e)
-                }
-        else:
-            return {
-                'status': 'error',
-                'message': 'No document exists to edit. Please generate a document first.'
-            }
-
-    elif func_name == 'get_current_date':
-        # Just return the current date, let the LLM handle relative calculations
-        today = datetime.now()
         return {
             'status': 'success',
-            'date': today.strftime('%Y-%m-%d'),
-            'description': 'Current date'
+            'message': f'Document updated: {changes}',
+            'changes': changes,
+            'doc_version': doc_version
+        }
+    except ValueError as e:
+        return {
+            'status': 'error',
+            'message': str(e)
         }
 
+
+def _handle_date(conversation_id: str, func_args: dict) -> dict:
+    """Handle get_current_date."""
+    # Just return the current date, let the LLM handle relative calculations
+    today = datetime.now()
     return {
-        'status': 'error',
-        'message': f'Unknown function: {func_name}'
+        'status': 'success',
+        'date': today.strftime('%Y-%m-%d'),
+        'description': 'Current date'
     }
+
+
+# Function name -> handler taking (conversation_id, func_args)
+_HANDLERS = {
+    'extract_information': _handle_extract,
+    'generate_document': _handle_generate,
+    'apply_edits': _handle_edits,
+    'get_current_date': _handle_date,
+}
+
+
+def execute_function(conversation_id: str, func_name: str, func_args: dict) -> dict:
+    """
+    Execute a function call from the LLM.
+
+    Args:
+        conversation_id: Conversation ID
+        func_name: Function name
+        func_args: Function arguments
+
+    Returns:
+        Function result dictionary
+    """
+    handler = _HANDLERS.get(func_name)
+    if handler is None:
+        return {
+            'status': 'error',
+            'message': f'Unknown function: {func_name}'
+        }
+    return handler(conversation_id, func_args)
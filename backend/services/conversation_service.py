@@ -2,19 +2,37 @@
 Conversation management service.
 Handles conversation history and document state.
 """
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from itertools import islice
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import binascii
+import threading
 import uuid
 
 
 class ConversationService:
     """Service for managing conversations and document state."""
 
+    # Maximum number of live Gemini chat sessions kept in memory
+    MAX_SESSIONS = 1024
+    # Number of recent PDF versions kept per conversation
+    MAX_DOCUMENT_VERSIONS = 4
+
     def __init__(self):
         """Initialize conversation storage."""
         # In-memory storage for conversations and documents
         self._conversations: Dict[str, List[Dict]] = {}
         # Store both PDF bytes and document data
-        self._documents: Dict[str, Dict] = {}  # {conversation_id: {pdf: bytes, data: dict}}
+        # {conversation_id: {version: int, data: dict, pdfs: {version: (preview, download)},
+        #                    base64: {(version, download): str}}}
+        self._documents: Dict[str, Dict] = {}
+        # LRU cache of live chat sessions so each turn doesn't rebuild one from history
+        self._sessions: OrderedDict[str, Any] = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        # Per-conversation turn locks with the number of turns holding or waiting
+        # on each; an entry only exists while a turn is in flight
+        self._turn_locks: Dict[str, List] = {}
 
     def create_conversation(self) -> str:
         """
@@ -49,43 +67,134 @@ class ConversationService:
             'parts': [content]
         })
 
-    def get_history(self, conversation_id: str) -> List[Dict]:
+    def get_history(self, conversation_id: str, exclude_last: bool = False) -> Iterable[Dict]:
         """
         Get conversation history.
 
         Args:
             conversation_id: Conversation ID
+            exclude_last: Skip the most recent message without copying the list
 
         Returns:
-            List of messages in conversation
+            List of messages in conversation, or a lazy view over all but
+            the last message when exclude_last is set
         """
-        return self._conversations.get(conversation_id, [])
+        history = self._conversations.get(conversation_id, [])
+        if exclude_last:
+            return islice(history, max(len(history) - 1, 0))
+        return history
 
-    def set_document(self, conversation_id: str, pdf_bytes: bytes, doc_data: Dict) -> None:
+    def set_document(
+        self,
+        conversation_id: str,
+        pdf_bytes: bytes,
+        doc_data: Dict,
+        preview_bytes: Optional[bytes] = None
+    ) -> int:
         """
-        Store document for a conversation.
+        Store a new version of the document for a conversation.
 
         Args:
             conversation_id: Conversation ID
-            pdf_bytes: PDF document as bytes
+            pdf_bytes: PDF document as bytes (the download version)
             doc_data: Document data dictionary for editing
+            preview_bytes: Highlighted preview PDF, if it differs from pdf_bytes
+
+        Returns:
+            Version number of the stored document
         """
-        self._documents[conversation_id] = {
-            'pdf': pdf_bytes,
-            'data': doc_data
-        }
+        doc = self._documents.get(conversation_id)
+        if doc is None:
+            doc = self._documents[conversation_id] = {'version': 0, 'pdfs': OrderedDict(), 'base64': {}}
+
+        version = doc['version'] + 1
+        doc['version'] = version
+        doc['data'] = doc_data
+        doc['pdfs'][version] = (preview_bytes if preview_bytes is not None else pdf_bytes, pdf_bytes)
+
+        # Keep a few recent versions so in-flight fetches don't miss
+        while len(doc['pdfs']) > self.MAX_DOCUMENT_VERSIONS:
+            old_version, _ = doc['pdfs'].popitem(last=False)
+            doc['base64'].pop((old_version, False), None)
+            doc['base64'].pop((old_version, True), None)
+
+        return version
 
     def get_document(self, conversation_id: str) -> Optional[Dict]:
         """
-        Get document for a conversation.
+        Get document metadata for a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Dictionary with 'version' (int) and 'data' (dict) if exists, None otherwise
+        """
+        doc = self._documents.get(conversation_id)
+        if not doc:
+            return None
+        return {'version': doc['version'], 'data': doc['data']}
+
+    def get_document_pdf(
+        self,
+        conversation_id: str,
+        version: int,
+        download: bool = False
+    ) -> Optional[bytes]:
+        """
+        Get the PDF bytes for a stored document version.
+
+        Args:
+            conversation_id: Conversation ID
+            version: Document version number
+            download: Return the download version instead of the highlighted preview
+
+        Returns:
+            PDF bytes if the version is still stored, None otherwise
+        """
+        doc = self._documents.get(conversation_id)
+        if not doc:
+            return None
+        pdfs = doc['pdfs'].get(version)
+        if pdfs is None:
+            return None
+        return pdfs[1] if download else pdfs[0]
+
+    def get_document_base64(
+        self,
+        conversation_id: str,
+        version: int,
+        download: bool = False
+    ) -> Optional[str]:
+        """
+        Get a stored document version as base64, encoding it on first use.
+
+        The encoding is kept with the version, so it is freed when the version
+        is evicted or the conversation is deleted. When preview and download
+        are the same PDF, the same string is returned for both.
 
         Args:
             conversation_id: Conversation ID
+            version: Document version number
+            download: Encode the download version instead of the highlighted preview
 
         Returns:
-            Dictionary with 'pdf' (bytes) and 'data' (dict) if exists, None otherwise
+            Base64 text if the version is still stored, None otherwise
         """
-        return self._documents.get(conversation_id)
+        doc = self._documents.get(conversation_id)
+        if not doc:
+            return None
+        pdfs = doc['pdfs'].get(version)
+        if pdfs is None:
+            return None
+        if download and pdfs[1] is pdfs[0]:
+            download = False
+        key = (version, download)
+        encoded = doc['base64'].get(key)
+        if encoded is None:
+            pdf_bytes = pdfs[1] if download else pdfs[0]
+            encoded = doc['base64'][key] = binascii.b2a_base64(pdf_bytes, newline=False).decode('ascii')
+        return encoded
 
     def get_document_data(self, conversation_id: str) -> Optional[Dict]:
         """
@@ -100,6 +209,91 @@ class ConversationService:
         doc = self._documents.get(conversation_id)
         return doc['data'] if doc else None
 
+    def get_session(self, conversation_id: str) -> Optional[Any]:
+        """
+        Get the cached chat session for a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Chat session if cached, None otherwise
+        """
+        with self._sessions_lock:
+            session = self._sessions.get(conversation_id)
+            if session is not None:
+                self._sessions.move_to_end(conversation_id)
+            return session
+
+    def get_or_create_session(
+        self,
+        conversation_id: str,
+        factory: Callable[[], Any]
+    ) -> Any:
+        """
+        Get the cached chat session for a conversation, creating it on a miss.
+
+        The factory runs outside the lock; if another request cached a session
+        for the same conversation in the meantime, that session is kept.
+
+        Args:
+            conversation_id: Conversation ID
+            factory: Called with no arguments to build a new session
+
+        Returns:
+            Cached or newly created chat session
+        """
+        session = self.get_session(conversation_id)
+        if session is not None:
+            return session
+
+        session = factory()
+        with self._sessions_lock:
+            existing = self._sessions.get(conversation_id)
+            if existing is not None:
+                self._sessions.move_to_end(conversation_id)
+                return existing
+            self._sessions[conversation_id] = session
+            while len(self._sessions) > self.MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        return session
+
+    @contextmanager
+    def turn_lock(self, conversation_id: str) -> Iterator[None]:
+        """
+        Serialize chat turns for a conversation.
+
+        Hold it for the whole turn, from recording the user message to
+        storing the reply, so two requests never drive the same session.
+        The lock is discarded once no turn holds or waits for it.
+
+        Args:
+            conversation_id: Conversation ID
+        """
+        with self._sessions_lock:
+            entry = self._turn_locks.get(conversation_id)
+            if entry is None:
+                entry = self._turn_locks[conversation_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._sessions_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._turn_locks[conversation_id]
+
+    def drop_session(self, conversation_id: str) -> None:
+        """
+        Remove the cached chat session for a conversation, if any.
+
+        Args:
+            conversation_id: Conversation ID
+        """
+        with self._sessions_lock:
+            self._sessions.pop(conversation_id, None)
+
     def conversation_exists(self, conversation_id: str) -> bool:
         """
         Check if conversation exists.
@@ -126,6 +320,7 @@ class ConversationService:
             del self._conversations[conversation_id]
             if conversation_id in self._documents:
                 del self._documents[conversation_id]
+            self.drop_session(conversation_id)
             return True
         return False
 
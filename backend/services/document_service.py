@@ -2,36 +2,446 @@
 Document generation service.
 Handles creation and editing of legal documents with PDF generation.
 """
-import re
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from string import Formatter
+from xml.sax.saxutils import escape as xml_escape, unescape as xml_unescape
 from io import BytesIO
-from typing import Dict, Tuple, Any, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Any, Optional, Union
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib import colors
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+
+# Colors and spacing shared by both renderers
+_HEADING_COLOR = colors.HexColor('#1a1a1a')
+_BODY_COLOR = colors.HexColor('#333333')
+_HIGHLIGHT_COLOR = colors.yellow
+
+# Extra space after titles and headings
+_HEADING_SPACE = 0.2 * inch
+
+# Paragraph styles are built once at import and shared by every document
+_BASE_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_BASE_STYLES['Heading1'],
+    fontSize=18,
+    textColor=_HEADING_COLOR,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_BASE_STYLES['Heading2'],
+    fontSize=12,
+    textColor=_HEADING_COLOR,
+    spaceAfter=12,
+    spaceBefore=12,
+    fontName='Helvetica-Bold'
+)
+
+_NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=10,
+    textColor=_BODY_COLOR,
+    spaceAfter=12,
+    alignment=TA_JUSTIFY,
+    leading=14
+)
+
+_BULLET_STYLE = ParagraphStyle(
+    'CustomBullet',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=10,
+    textColor=_BODY_COLOR,
+    leftIndent=20,
+    spaceAfter=6,
+    leading=14
+)
+
+_SIGNATURE_STYLE = ParagraphStyle(
+    'CustomSignature',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=10,
+    textColor=_BODY_COLOR,
+    spaceAfter=6,
+    leading=14
+)
+
+# Styles followed by the extra heading space
+_SPACED_STYLES = frozenset((_TITLE_STYLE, _HEADING_STYLE))
+
+
+class Block(NamedTuple):
+    """One paragraph of a document, carrying its resolved style."""
+    text: str
+    style: ParagraphStyle
+    highlight: bool = False
+
+
+def _segment_filler(text: str):
+    """
+    Split a format string once into constant segments and placeholder slots.
+
+    Returns a function that fills the slots from a values dict and joins the
+    segments, giving the same result as text.format_map without re-parsing
+    the format string on every call.
+    """
+    segments = []
+    slots = []
+    for literal, field, _, _ in Formatter().parse(text):
+        if literal:
+            segments.append(literal)
+        if field is not None:
+            slots.append((len(segments), field))
+            segments.append(None)
+    segments = tuple(segments)
+    slots = tuple(slots)
+
+    def fill(values: Dict) -> str:
+        parts = list(segments)
+        for index, field in slots:
+            parts[index] = values[field]
+        return ''.join(parts)
+
+    return fill
+
+
+def _compile_template(entries: tuple) -> tuple:
+    """
+    Prepare (text, style, fields) template entries for rendering.
+
+    Whether an entry needs formatting is decided once here: entries with a
+    placeholder get a segment filler, static text keeps None.
+    """
+    return tuple(
+        (text, _segment_filler(text) if '{' in text else None, style, fields)
+        for text, style, fields in entries
+    )
+
+
+# Clauses and lines shared by several templates
+_BLANK = ('', _NORMAL_STYLE, ())
+_GOVERNING_LAW = ('This Agreement shall be governed by the laws of the applicable jurisdiction.', _NORMAL_STYLE, ())
+_SIGNATURE_LINE = '_________________________________<br/>'
+_DATED = '<br/>Date: _______________'
+
+# Fixed document templates: (text, style, fields that highlight the block).
+# Text containing '{' is filled from the document data by field name;
+# everything else is used as is.
+
+# Director appointment resolution
+_DIRECTOR_APPOINTMENT_TEMPLATE = _compile_template((
+    ('BOARD RESOLUTION', _TITLE_STYLE, ()),
+    ('APPOINTMENT OF DIRECTOR', _TITLE_STYLE, ()),
+    _BLANK,
+    ('Resolution Number: {resolution_number}', _NORMAL_STYLE, ('resolution_number',)),
+    ('Date: {effective_date}', _NORMAL_STYLE, ('effective_date',)),
+    _BLANK,
+    ('RESOLVED THAT:', _HEADING_STYLE, ()),
+    _BLANK,
+    ('1. APPOINTMENT', _HEADING_STYLE, ()),
+    ('{director_name} is hereby appointed as a Director of the Company, effective {effective_date}.', _NORMAL_STYLE, ('director_name', 'effective_date')),
+    _BLANK,
+    ('2. AUTHORITY', _HEADING_STYLE, ()),
+    ("The Director shall have all rights, powers, and responsibilities as set forth in the Company's Articles of Incorporation and Bylaws.", _NORMAL_STYLE, ()),
+    _BLANK,
+    ('3. COMMITTEE ASSIGNMENTS', _HEADING_STYLE, ()),
+    ('{director_name} is{committee_clause}.', _NORMAL_STYLE, ('committees',)),
+    _BLANK,
+    ('4. EFFECTIVE DATE', _HEADING_STYLE, ()),
+    ('This resolution shall be effective as of {effective_date}.', _NORMAL_STYLE, ('effective_date',)),
+    _BLANK,
+    ('5. CERTIFICATION', _HEADING_STYLE, ()),
+    ('The undersigned Secretary certifies that the foregoing resolution was duly adopted by the Board of Directors and remains in full force and effect.', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('Executed this day: {effective_date}', _NORMAL_STYLE, ('effective_date',)),
+    _BLANK,
+    (_SIGNATURE_LINE + 'Corporate Secretary', _SIGNATURE_STYLE, ()),
+    _BLANK,
+    (_SIGNATURE_LINE + 'Board Chairperson', _SIGNATURE_STYLE, ()),
+))
+
+# Non-Disclosure Agreement
+_NDA_TEMPLATE = _compile_template((
+    ('NON-DISCLOSURE AGREEMENT', _TITLE_STYLE, ()),
+    _BLANK,
+    ('This Non-Disclosure Agreement ("Agreement") is entered into as of {effective_date} ("Effective Date")', _NORMAL_STYLE, ('effective_date',)),
+    _BLANK,
+    ('BETWEEN:', _HEADING_STYLE, ()),
+    ('{party1_name} ("Disclosing Party")', _NORMAL_STYLE, ('party1_name',)),
+    _BLANK,
+    ('AND:', _HEADING_STYLE, ()),
+    ('{party2_name} ("Receiving Party")', _NORMAL_STYLE, ('party2_name',)),
+    _BLANK,
+    ('WHEREAS the Disclosing Party possesses certain confidential and proprietary information; and', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('WHEREAS the Receiving Party desires to receive such confidential information for legitimate business purposes;', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('NOW THEREFORE, in consideration of the mutual covenants and agreements contained herein, the parties agree as follows:', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('1. DEFINITION OF CONFIDENTIAL INFORMATION', _HEADING_STYLE, ()),
+    ('"Confidential Information" means any and all technical and non-technical information disclosed by the Disclosing Party, including but not limited to: trade secrets, business strategies, customer lists, financial information, product designs, software, and any other proprietary information.', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('2. OBLIGATIONS OF RECEIVING PARTY', _HEADING_STYLE, ()),
+    ('The Receiving Party agrees to:', _NORMAL_STYLE, ()),
+    ('a) Hold all Confidential Information in strict confidence', _BULLET_STYLE, ()),
+    ('b) Not disclose Confidential Information to any third party without prior written consent', _BULLET_STYLE, ()),
+    ('c) Use Confidential Information solely for the agreed business purpose', _BULLET_STYLE, ()),
+    ('d) Protect Confidential Information with the same degree of care used for its own confidential information', _BULLET_STYLE, ()),
+    _BLANK,
+    ('3. TERM', _HEADING_STYLE, ()),
+    ('This Agreement shall remain in effect for {term_years} years from the Effective Date. The obligations regarding Confidential Information shall survive termination for an additional {term_years} years.', _NORMAL_STYLE, ('term_years',)),
+    _BLANK,
+    ('4. RETURN OF MATERIALS', _HEADING_STYLE, ()),
+    ('Upon termination or upon request, the Receiving Party shall return or destroy all Confidential Information and certify such destruction in writing.', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('5. NO LICENSE', _HEADING_STYLE, ()),
+    ('Nothing in this Agreement grants any license or right to the Receiving Party regarding intellectual property of the Disclosing Party.', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('6. GOVERNING LAW', _HEADING_STYLE, ()),
+    _GOVERNING_LAW,
+    _BLANK,
+    ('IN WITNESS WHEREOF, the parties have executed this Agreement as of the Effective Date.', _NORMAL_STYLE, ()),
+    _BLANK,
+    (_SIGNATURE_LINE + 'Disclosing Party: {party1_name}' + _DATED, _SIGNATURE_STYLE, ('party1_name',)),
+    _BLANK,
+    _BLANK,
+    (_SIGNATURE_LINE + 'Receiving Party: {party2_name}' + _DATED, _SIGNATURE_STYLE, ('party2_name',)),
+))
+
+# Employment Agreement
+_EMPLOYMENT_AGREEMENT_TEMPLATE = _compile_template((
+    ('EMPLOYMENT AGREEMENT', _TITLE_STYLE, ()),
+    _BLANK,
+    ('This Employment Agreement ("Agreement") is entered into as of {start_date}', _NORMAL_STYLE, ('start_date',)),
+    _BLANK,
+    ('BETWEEN:', _HEADING_STYLE, ()),
+    ('{company_name} ("Company")', _NORMAL_STYLE, ('company_name',)),
+    _BLANK,
+    ('AND:', _HEADING_STYLE, ()),
+    ('{employee_name} ("Employee")', _NORMAL_STYLE, ('employee_name',)),
+    _BLANK,
+    ('1. POSITION AND DUTIES', _HEADING_STYLE, ()),
+    ('The Company hereby employs the Employee in the position of {position}. The Employee accepts such employment and agrees to perform all duties and responsibilities associated with this position.', _NORMAL_STYLE, ('position',)),
+    _BLANK,
+    ('2. COMPENSATION', _HEADING_STYLE, ()),
+    ("The Company shall pay the Employee an annual salary of {salary}, payable in accordance with the Company's standard payroll practices.", _NORMAL_STYLE, ('salary',)),
+    _BLANK,
+    ('3. START DATE', _HEADING_STYLE, ()),
+    ('Employment shall commence on {start_date}.', _NORMAL_STYLE, ('start_date',)),
+    _BLANK,
+    ('4. EMPLOYMENT RELATIONSHIP', _HEADING_STYLE, ()),
+    ('This is an at-will employment relationship. Either party may terminate this agreement at any time, with or without cause, with or without notice.', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('5. DUTIES AND RESPONSIBILITIES', _HEADING_STYLE, ()),
+    ('The Employee shall:', _NORMAL_STYLE, ()),
+    ('a) Devote their full business time and attention to the performance of their duties', _BULLET_STYLE, ()),
+    ('b) Comply with all Company policies and procedures', _BULLET_STYLE, ()),
+    ('c) Act in the best interests of the Company at all times', _BULLET_STYLE, ()),
+    ('d) Not engage in any competing business activities', _BULLET_STYLE, ()),
+    _BLANK,
+    ('6. CONFIDENTIALITY', _HEADING_STYLE, ()),
+    ('The Employee acknowledges that during employment they will have access to confidential information and trade secrets of the Company. The Employee agrees to maintain strict confidentiality of all such information during and after employment.', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('7. BENEFITS', _HEADING_STYLE, ()),
+    ('The Employee shall be eligible for benefits in accordance with Company policies, including but not limited to health insurance, paid time off, and retirement plans as applicable.', _NORMAL_STYLE, ()),
+    _BLANK,
+    ('8. TERMINATION', _HEADING_STYLE, ()),
+    ('Either party may terminate this Agreement with written notice. Upon termination, the Employee shall:', _NORMAL_STYLE, ()),
+    ('a) Return all Company property', _BULLET_STYLE, ()),
+    ('b) Continue to maintain confidentiality obligations', _BULLET_STYLE, ()),
+    ('c) Receive final compensation for work performed through the termination date', _BULLET_STYLE, ()),
+    _BLANK,
+    ('9. GOVERNING LAW', _HEADING_STYLE, ()),
+    _GOVERNING_LAW,
+    _BLANK,
+    ('IN WITNESS WHEREOF, the parties have executed this Agreement as of the date first written above.', _NORMAL_STYLE, ()),
+    _BLANK,
+    (_SIGNATURE_LINE + 'Company Representative: {company_name}' + _DATED, _SIGNATURE_STYLE, ('company_name',)),
+    _BLANK,
+    _BLANK,
+    (_SIGNATURE_LINE + 'Employee: {employee_name}' + _DATED, _SIGNATURE_STYLE, ('employee_name',)),
+))
+
+# Document type -> fixed template
+_TEMPLATES = {
+    'director_appointment': _DIRECTOR_APPOINTMENT_TEMPLATE,
+    'nda': _NDA_TEMPLATE,
+    'employment_agreement': _EMPLOYMENT_AGREEMENT_TEMPLATE,
+}
+
+# Document type -> fields that highlight at least one block of its template;
+# custom documents highlight section headings, so they are not listed
+_HIGHLIGHTABLE_FIELDS = {
+    doc_type: frozenset(chain.from_iterable(entry[3] for entry in template))
+    for doc_type, template in _TEMPLATES.items()
+}
+
+
+@lru_cache(maxsize=256)
+def _template_blocks_cached(doc_type: str, items: tuple, highlight_field: Optional[str]) -> tuple:
+    """Fill a fixed template from (field, escaped text) pairs, memoized on all arguments."""
+    values = dict(items)
+    return tuple(
+        Block(fill(values) if fill else text, style, highlight_field in fields)
+        for text, fill, style, fields in _TEMPLATES[doc_type]
+    )
+
+
+def _template_blocks(doc_type: str, values: Dict, highlight_field: Optional[str]) -> Sequence[Block]:
+    """
+    Get the content blocks for a fixed template, reusing them for repeated data.
+
+    Values are stringified and escaped for Paragraph markup before the cache
+    lookup, so the key is the text that ends up in the document (3 and 3.0
+    are different entries). The returned tuple is shared between calls and
+    must not be modified.
+    """
+    items = tuple((key, _xml_escape(str(value))) for key, value in values.items())
+    return _template_blocks_cached(doc_type, items, highlight_field)
+
+
+def _empty_spacer(style: ParagraphStyle) -> Spacer:
+    """
+    Create the Spacer that takes the place of an empty paragraph in a style.
+
+    Like the empty paragraph it has no height and only the style's spaceAfter,
+    so page breaks fall where they did. A new instance is needed each time:
+    the layout engine records per-flowable state while splitting pages.
+    """
+    spacer = Spacer(1, 0)
+    spacer.spaceAfter = style.spaceAfter
+    return spacer
+
+
+@lru_cache(maxsize=1024)
+def _xml_escape(text: str) -> str:
+    """Escape user text for Paragraph markup; cached since values repeat across renders."""
+    return xml_escape(text)
+
+
+# Blank spacer line, shared by every custom document
+_BLANK_BLOCK = Block("", _NORMAL_STYLE)
+
+# Closing lines of a custom document
+_CUSTOM_SIGNATURE_BLOCKS = (
+    _BLANK_BLOCK,
+    Block(_SIGNATURE_LINE + "Signature", _SIGNATURE_STYLE),
+    _BLANK_BLOCK,
+    Block("Date: _______________", _SIGNATURE_STYLE),
+)
+
+
+def _section_blocks(index: int, section: Any, highlight_field: Optional[str]) -> Iterator[Block]:
+    """Yield the content blocks for one numbered section of a custom document."""
+    # Handle section as dict or string
+    if isinstance(section, dict):
+        heading = section.get('heading', f'Section {index}')
+        content = section.get('content', '')
+    else:
+        # Section is a string - use it as content with default heading
+        heading = f'Section {index}'
+        content = str(section)
+
+    # Check if this section is being highlighted (by heading name)
+    is_highlighted = highlight_field == heading
+
+    yield Block(f"{index}. {_xml_escape(str(heading).upper())}", _HEADING_STYLE, is_highlighted)
+
+    # Handle content that might be a list or a string
+    if isinstance(content, list):
+        for item in content:
+            yield Block(_xml_escape(str(item)), _BULLET_STYLE, is_highlighted)
+    else:
+        yield Block(_xml_escape(str(content)), _NORMAL_STYLE, is_highlighted)
+    yield _BLANK_BLOCK
+
+
+@lru_cache(maxsize=None)
+def _highlighted(style: ParagraphStyle) -> ParagraphStyle:
+    """Get the highlighted variant of a style, created once per style."""
+    return ParagraphStyle(
+        f'Highlighted{style.name}',
+        parent=style,
+        backColor=_HIGHLIGHT_COLOR
+    )
 
 
 class DocumentService:
     """Service for generating and editing legal documents."""
 
+    # Draw fixed-layout documents straight onto a canvas instead of running
+    # Platypus flow layout; output is visually close but not identical
+    USE_FAST_PDF = False
+
     @staticmethod
-    def _create_pdf(content_blocks: list, title: str = "Legal Document") -> bytes:
+    def _create_pdf(
+        content_blocks: list,
+        title: str = "Legal Document",
+        output: Optional[BinaryIO] = None,
+        zero_copy: bool = False
+    ) -> Optional[Union[bytes, memoryview]]:
         """
         Create a PDF from content blocks.
 
         Args:
-            content_blocks: List of tuples (text, style_name) where style_name is
-                          'title', 'heading', 'normal', 'bullet', or 'signature'
+            content_blocks: List of Blocks (text, paragraph style, highlight flag)
             title: Document title for metadata
+            output: Optional writable binary stream (file, response stream, spooled
+                    temp file) to render into instead of an in-memory buffer
+            zero_copy: Return a memoryview over the render buffer instead of a
+                       bytes copy (bypasses the PDF cache)
 
         Returns:
-            PDF as bytes
+            PDF as bytes (memoryview if zero_copy), or None if it was written to output
+        """
+        if zero_copy and output is None:
+            # The view keeps the buffer alive; no getvalue() copy is made
+            buffer = BytesIO()
+            DocumentService._render_pdf(content_blocks, title, buffer)
+            return buffer.getbuffer()
+        if output is None:
+            # Identical blocks render to identical bytes; serve repeats from the cache
+            return _render_pdf_cached(tuple(content_blocks), title, DocumentService.USE_FAST_PDF)
+        DocumentService._render_pdf(content_blocks, title, output)
+        return None
+
+    @staticmethod
+    def _render_pdf(
+        content_blocks: Iterable,
+        title: str,
+        output: BinaryIO,
+        fast: Optional[bool] = None
+    ) -> None:
         """
-        buffer = BytesIO()
+        Lay out content blocks with ReportLab and write the PDF to a stream.
+
+        Args:
+            content_blocks: Content blocks as accepted by _create_pdf
+            title: Document title for metadata
+            output: Writable binary stream
+            fast: Use the canvas renderer; defaults to USE_FAST_PDF
+        """
+        if DocumentService.USE_FAST_PDF if fast is None else fast:
+            DocumentService._render_pdf_fast(content_blocks, title, output)
+            return
+
         doc = SimpleDocTemplate(
-            buffer,
+            output,
             pagesize=letter,
             rightMargin=72,
             leftMargin=72,
@@ -39,117 +449,94 @@ class DocumentService:
             bottomMargin=72,
         )
 
-        # Define styles
-        styles = getSampleStyleSheet()
-
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
+        # Build story
+        story = []
+        for text, style, highlight in content_blocks:
+            if not text:
+                # An empty paragraph only contributes its spaceAfter
+                story.append(_empty_spacer(style))
+                continue
+            story.append(Paragraph(text, _highlighted(style) if highlight else style))
+            if style in _SPACED_STYLES:
+                story.append(Spacer(1, _HEADING_SPACE))
 
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=12,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
+        doc.build(story)
 
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=12,
-            alignment=TA_JUSTIFY,
-            leading=14
-        )
+    @staticmethod
+    def _render_pdf_fast(content_blocks: Iterable, title: str, output: BinaryIO) -> None:
+        """
+        Draw content blocks line by line on a canvas, skipping flow layout.
 
-        bullet_style = ParagraphStyle(
-            'CustomBullet',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#333333'),
-            leftIndent=20,
-            spaceAfter=6,
-            leading=14
-        )
+        Uses the same paragraph styles (font, size, leading, spacing, indent,
+        alignment, color) as the Platypus path. Text is wrapped with
+        simpleSplit and paginated by hand.
 
-        signature_style = ParagraphStyle(
-            'CustomSignature',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=6,
-            leading=14
-        )
+        Args:
+            content_blocks: Content blocks as accepted by _create_pdf
+            title: Document title for metadata
+            output: Writable binary stream
+        """
+        page_width, page_height = letter
+        margin = 72
+        frame_width = page_width - 2 * margin
+        top = page_height - margin
 
-        style_map = {
-            'title': title_style,
-            'heading': heading_style,
-            'normal': normal_style,
-            'bullet': bullet_style,
-            'signature': signature_style
-        }
+        pdf = canvas.Canvas(output, pagesize=letter)
+        pdf.setTitle(title)
+        y = top
 
-        # Build story
-        story = []
-        for block in content_blocks:
-            text = block[0]
-            style_name = block[1]
-            highlight = False
-            if len(block) > 2:
-                highlight = block[2]
-            
-            style = style_map.get(style_name, normal_style)
-            
-            if highlight:
-                # Create a highlighted version of the style
-                style = ParagraphStyle(
-                    f'Highlighted{style_name}',
-                    parent=style,
-                    backColor=colors.yellow
-                )
-            
-            story.append(Paragraph(text, style))
-            if style_name in ['title', 'heading']:
-                story.append(Spacer(1, 0.2 * inch))
+        for text, style, highlight in content_blocks:
+            if y < top:
+                y -= style.spaceBefore
 
-        doc.build(story)
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
-        return pdf_bytes
+            width = frame_width - style.leftIndent
+            lines = [
+                line
+                for segment in text.split('<br/>')
+                for line in simpleSplit(xml_unescape(segment), style.fontName, style.fontSize, width)
+            ] if text else ()
+            for line in lines:
+                if y - style.leading < margin:
+                    pdf.showPage()
+                    y = top
+                y -= style.leading
+                if style.alignment == TA_CENTER:
+                    x = margin + (frame_width - stringWidth(line, style.fontName, style.fontSize)) / 2
+                else:
+                    x = margin + style.leftIndent
+                if highlight:
+                    pdf.setFillColor(_HIGHLIGHT_COLOR)
+                    pdf.rect(
+                        margin + style.leftIndent, y - style.fontSize * 0.25,
+                        width, style.leading, stroke=0, fill=1
+                    )
+                pdf.setFillColor(style.textColor)
+                pdf.setFont(style.fontName, style.fontSize)
+                pdf.drawString(x, y + (style.leading - style.fontSize) / 2, line)
+
+            y -= style.spaceAfter
+            if style in _SPACED_STYLES:
+                y -= _HEADING_SPACE
+
+        pdf.save()
 
     @staticmethod
-    def generate_director_appointment(data: Dict, highlight_field: Optional[str] = None) -> Tuple[bytes, Dict]:
+    def _build_director_appointment_blocks(data: Dict, highlight_field: Optional[str] = None) -> Tuple[Sequence[Block], Dict, str]:
         """
-        Generate a director appointment resolution as PDF.
-
-        Args:
-            data: Dictionary containing director information
-                - director_name: Name of the director
-                - effective_date: Date of appointment
-                - committees: Committees to join (optional)
-                - resolution_number: Resolution number (optional)
-            highlight_field: Optional field name to highlight
+        Build the content blocks for a director appointment resolution.
 
         Returns:
-            Tuple of (PDF bytes, document data dictionary)
+            Tuple of (content blocks, document data dictionary, PDF title)
         """
         name = data.get('director_name', '[DIRECTOR NAME]')
         effective_date = data.get('effective_date', '[EFFECTIVE DATE]')
         committees = data.get('committees', '')
         resolution_number = data.get('resolution_number', 'RES-2024-001')
 
-        committee_text = f" and appointed to the {committees}" if committees else ""
+        committee_clause = (
+            f" and appointed to the {committees}" if committees
+            else " not assigned to any committees at this time"
+        )
 
         # Store structured data for editing
         doc_data = {
@@ -160,57 +547,47 @@ class DocumentService:
             'resolution_number': resolution_number
         }
 
-        content_blocks = [
-            ("BOARD RESOLUTION", 'title'),
-            ("APPOINTMENT OF DIRECTOR", 'title'),
-            ("", 'normal'),
-            (f"Resolution Number: {resolution_number}", 'normal', highlight_field == 'resolution_number'),
-            (f"Date: {effective_date}", 'normal', highlight_field == 'effective_date'),
-            ("", 'normal'),
-            ("RESOLVED THAT:", 'heading'),
-            ("", 'normal'),
-            ("1. APPOINTMENT", 'heading'),
-            (f"{name} is hereby appointed as a Director of the Company, effective {effective_date}.", 'normal', highlight_field == 'director_name' or highlight_field == 'effective_date'),
-            ("", 'normal'),
-            ("2. AUTHORITY", 'heading'),
-            ("The Director shall have all rights, powers, and responsibilities as set forth in the Company's Articles of Incorporation and Bylaws.", 'normal'),
-            ("", 'normal'),
-            ("3. COMMITTEE ASSIGNMENTS", 'heading'),
-            (f"{name} is{committee_text if committee_text else ' not assigned to any committees at this time'}.", 'normal', highlight_field == 'committees'),
-            ("", 'normal'),
-            ("4. EFFECTIVE DATE", 'heading'),
-            (f"This resolution shall be effective as of {effective_date}.", 'normal', highlight_field == 'effective_date'),
-            ("", 'normal'),
-            ("5. CERTIFICATION", 'heading'),
-            ("The undersigned Secretary certifies that the foregoing resolution was duly adopted by the Board of Directors and remains in full force and effect.", 'normal'),
-            ("", 'normal'),
-            (f"Executed this day: {effective_date}", 'normal', highlight_field == 'effective_date'),
-            ("", 'normal'),
-            ("_________________________________", 'signature'),
-            ("Corporate Secretary", 'signature'),
-            ("", 'normal'),
-            ("_________________________________", 'signature'),
-            ("Board Chairperson", 'signature'),
-        ]
+        content_blocks = _template_blocks(
+            'director_appointment',
+            {**doc_data, 'committee_clause': committee_clause},
+            highlight_field
+        )
 
-        pdf_bytes = DocumentService._create_pdf(content_blocks, "Director Appointment Resolution")
-        return pdf_bytes, doc_data
+        return content_blocks, doc_data, "Director Appointment Resolution"
 
     @staticmethod
-    def generate_nda(data: Dict, highlight_field: Optional[str] = None) -> Tuple[bytes, Dict]:
+    def generate_director_appointment(
+        data: Dict,
+        highlight_field: Optional[str] = None,
+        output: Optional[BinaryIO] = None,
+        zero_copy: bool = False
+    ) -> Tuple[Optional[Union[bytes, memoryview]], Dict]:
         """
-        Generate a Non-Disclosure Agreement as PDF.
+        Generate a director appointment resolution as PDF.
 
         Args:
-            data: Dictionary containing NDA information
-                - party1_name: First party name
-                - party2_name: Second party name
-                - effective_date: Effective date
-                - term_years: Term in years (optional)
+            data: Dictionary containing director information
+                - director_name: Name of the director
+                - effective_date: Date of appointment
+                - committees: Committees to join (optional)
+                - resolution_number: Resolution number (optional)
             highlight_field: Optional field name to highlight
+            output: Optional binary stream to write the PDF into
+            zero_copy: Return the PDF as a memoryview instead of bytes
+
+        Returns:
+            Tuple of (PDF bytes or None if written to output, document data dictionary)
+        """
+        content_blocks, doc_data, title = DocumentService._build_director_appointment_blocks(data, highlight_field)
+        return DocumentService._create_pdf(content_blocks, title, output, zero_copy), doc_data
+
+    @staticmethod
+    def _build_nda_blocks(data: Dict, highlight_field: Optional[str] = None) -> Tuple[Sequence[Block], Dict, str]:
+        """
+        Build the content blocks for a Non-Disclosure Agreement.
 
         Returns:
-            Tuple of (PDF bytes, document data dictionary)
+            Tuple of (content blocks, document data dictionary, PDF title)
         """
         party1 = data.get('party1_name', '[PARTY 1 NAME]')
         party2 = data.get('party2_name', '[PARTY 2 NAME]')
@@ -226,76 +603,43 @@ class DocumentService:
             'term_years': term_years
         }
 
-        content_blocks = [
-            ("NON-DISCLOSURE AGREEMENT", 'title'),
-            ("", 'normal'),
-            (f'This Non-Disclosure Agreement ("Agreement") is entered into as of {effective_date} ("Effective Date")', 'normal', highlight_field == 'effective_date'),
-            ("", 'normal'),
-            ("BETWEEN:", 'heading'),
-            (f'{party1} ("Disclosing Party")', 'normal', highlight_field == 'party1_name'),
-            ("", 'normal'),
-            ("AND:", 'heading'),
-            (f'{party2} ("Receiving Party")', 'normal', highlight_field == 'party2_name'),
-            ("", 'normal'),
-            ("WHEREAS the Disclosing Party possesses certain confidential and proprietary information; and", 'normal'),
-            ("", 'normal'),
-            ("WHEREAS the Receiving Party desires to receive such confidential information for legitimate business purposes;", 'normal'),
-            ("", 'normal'),
-            ("NOW THEREFORE, in consideration of the mutual covenants and agreements contained herein, the parties agree as follows:", 'normal'),
-            ("", 'normal'),
-            ("1. DEFINITION OF CONFIDENTIAL INFORMATION", 'heading'),
-            ('"Confidential Information" means any and all technical and non-technical information disclosed by the Disclosing Party, including but not limited to: trade secrets, business strategies, customer lists, financial information, product designs, software, and any other proprietary information.', 'normal'),
-            ("", 'normal'),
-            ("2. OBLIGATIONS OF RECEIVING PARTY", 'heading'),
-            ("The Receiving Party agrees to:", 'normal'),
-            ("a) Hold all Confidential Information in strict confidence", 'bullet'),
-            ("b) Not disclose Confidential Information to any third party without prior written consent", 'bullet'),
-            ("c) Use Confidential Information solely for the agreed business purpose", 'bullet'),
-            ("d) Protect Confidential Information with the same degree of care used for its own confidential information", 'bullet'),
-            ("", 'normal'),
-            ("3. TERM", 'heading'),
-            (f"This Agreement shall remain in effect for {term_years} years from the Effective Date. The obligations regarding Confidential Information shall survive termination for an additional {term_years} years.", 'normal', highlight_field == 'term_years'),
-            ("", 'normal'),
-            ("4. RETURN OF MATERIALS", 'heading'),
-            ("Upon termination or upon request, the Receiving Party shall return or destroy all Confidential Information and certify such destruction in writing.", 'normal'),
-            ("", 'normal'),
-            ("5. NO LICENSE", 'heading'),
-            ("Nothing in this Agreement grants any license or right to the Receiving Party regarding intellectual property of the Disclosing Party.", 'normal'),
-            ("", 'normal'),
-            ("6. GOVERNING LAW", 'heading'),
-            ("This Agreement shall be governed by the laws of the applicable jurisdiction.", 'normal'),
-            ("", 'normal'),
-            ("IN WITNESS WHEREOF, the parties have executed this Agreement as of the Effective Date.", 'normal'),
-            ("", 'normal'),
-            ("_________________________________", 'signature'),
-            (f"Disclosing Party: {party1}", 'signature', highlight_field == 'party1_name'),
-            ("Date: _______________", 'signature'),
-            ("", 'normal'),
-            ("", 'normal'),
-            ("_________________________________", 'signature'),
-            (f"Receiving Party: {party2}", 'signature', highlight_field == 'party2_name'),
-            ("Date: _______________", 'signature'),
-        ]
+        content_blocks = _template_blocks('nda', doc_data, highlight_field)
 
-        pdf_bytes = DocumentService._create_pdf(content_blocks, "Non-Disclosure Agreement")
-        return pdf_bytes, doc_data
+        return content_blocks, doc_data, "Non-Disclosure Agreement"
 
     @staticmethod
-    def generate_employment_agreement(data: Dict, highlight_field: Optional[str] = None) -> Tuple[bytes, Dict]:
+    def generate_nda(
+        data: Dict,
+        highlight_field: Optional[str] = None,
+        output: Optional[BinaryIO] = None,
+        zero_copy: bool = False
+    ) -> Tuple[Optional[Union[bytes, memoryview]], Dict]:
         """
-        Generate an Employment Agreement as PDF.
+        Generate a Non-Disclosure Agreement as PDF.
 
         Args:
-            data: Dictionary containing employment information
-                - employee_name: Employee name
-                - company_name: Company name
-                - position: Job position
-                - start_date: Start date
-                - salary: Annual salary
+            data: Dictionary containing NDA information
+                - party1_name: First party name
+                - party2_name: Second party name
+                - effective_date: Effective date
+                - term_years: Term in years (optional)
             highlight_field: Optional field name to highlight
+            output: Optional binary stream to write the PDF into
+            zero_copy: Return the PDF as a memoryview instead of bytes
 
         Returns:
-            Tuple of (PDF bytes, document data dictionary)
+            Tuple of (PDF bytes or None if written to output, document data dictionary)
+        """
+        content_blocks, doc_data, title = DocumentService._build_nda_blocks(data, highlight_field)
+        return DocumentService._create_pdf(content_blocks, title, output, zero_copy), doc_data
+
+    @staticmethod
+    def _build_employment_agreement_blocks(data: Dict, highlight_field: Optional[str] = None) -> Tuple[Sequence[Block], Dict, str]:
+        """
+        Build the content blocks for an Employment Agreement.
+
+        Returns:
+            Tuple of (content blocks, document data dictionary, PDF title)
         """
         employee_name = data.get('employee_name', '[EMPLOYEE NAME]')
         company_name = data.get('company_name', '[COMPANY NAME]')
@@ -313,83 +657,44 @@ class DocumentService:
             'salary': salary
         }
 
-        content_blocks = [
-            ("EMPLOYMENT AGREEMENT", 'title'),
-            ("", 'normal'),
-            (f"This Employment Agreement (\"Agreement\") is entered into as of {start_date}", 'normal', highlight_field == 'start_date'),
-            ("", 'normal'),
-            ("BETWEEN:", 'heading'),
-            (f'{company_name} ("Company")', 'normal', highlight_field == 'company_name'),
-            ("", 'normal'),
-            ("AND:", 'heading'),
-            (f'{employee_name} ("Employee")', 'normal', highlight_field == 'employee_name'),
-            ("", 'normal'),
-            ("1. POSITION AND DUTIES", 'heading'),
-            (f"The Company hereby employs the Employee in the position of {position}. The Employee accepts such employment and agrees to perform all duties and responsibilities associated with this position.", 'normal', highlight_field == 'position'),
-            ("", 'normal'),
-            ("2. COMPENSATION", 'heading'),
-            (f"The Company shall pay the Employee an annual salary of {salary}, payable in accordance with the Company's standard payroll practices.", 'normal', highlight_field == 'salary'),
-            ("", 'normal'),
-            ("3. START DATE", 'heading'),
-            (f"Employment shall commence on {start_date}.", 'normal', highlight_field == 'start_date'),
-            ("", 'normal'),
-            ("4. EMPLOYMENT RELATIONSHIP", 'heading'),
-            ("This is an at-will employment relationship. Either party may terminate this agreement at any time, with or without cause, with or without notice.", 'normal'),
-            ("", 'normal'),
-            ("5. DUTIES AND RESPONSIBILITIES", 'heading'),
-            ("The Employee shall:", 'normal'),
-            ("a) Devote their full business time and attention to the performance of their duties", 'bullet'),
-            ("b) Comply with all Company policies and procedures", 'bullet'),
-            ("c) Act in the best interests of the Company at all times", 'bullet'),
-            ("d) Not engage in any competing business activities", 'bullet'),
-            ("", 'normal'),
-            ("6. CONFIDENTIALITY", 'heading'),
-            ("The Employee acknowledges that during employment they will have access to confidential information and trade secrets of the Company. The Employee agrees to maintain strict confidentiality of all such information during and after employment.", 'normal'),
-            ("", 'normal'),
-            ("7. BENEFITS", 'heading'),
-            ("The Employee shall be eligible for benefits in accordance with Company policies, including but not limited to health insurance, paid time off, and retirement plans as applicable.", 'normal'),
-            ("", 'normal'),
-            ("8. TERMINATION", 'heading'),
-            ("Either party may terminate this Agreement with written notice. Upon termination, the Employee shall:", 'normal'),
-            ("a) Return all Company property", 'bullet'),
-            ("b) Continue to maintain confidentiality obligations", 'bullet'),
-            ("c) Receive final compensation for work performed through the termination date", 'bullet'),
-            ("", 'normal'),
-            ("9. GOVERNING LAW", 'heading'),
-            ("This Agreement shall be governed by the laws of the applicable jurisdiction.", 'normal'),
-            ("", 'normal'),
-            ("IN WITNESS WHEREOF, the parties have executed this Agreement as of the date first written above.", 'normal'),
-            ("", 'normal'),
-            ("_________________________________", 'signature'),
-            (f"Company Representative: {company_name}", 'signature', highlight_field == 'company_name'),
-            ("Date: _______________", 'signature'),
-            ("", 'normal'),
-            ("", 'normal'),
-            ("_________________________________", 'signature'),
-            (f"Employee: {employee_name}", 'signature', highlight_field == 'employee_name'),
-            ("Date: _______________", 'signature'),
-        ]
+        content_blocks = _template_blocks('employment_agreement', doc_data, highlight_field)
 
-        pdf_bytes = DocumentService._create_pdf(content_blocks, "Employment Agreement")
-        return pdf_bytes, doc_data
+        return content_blocks, doc_data, "Employment Agreement"
 
     @staticmethod
-    def generate_custom_document(data: Dict, highlight_field: Optional[str] = None) -> Tuple[bytes, Dict]:
+    def generate_employment_agreement(
+        data: Dict,
+        highlight_field: Optional[str] = None,
+        output: Optional[BinaryIO] = None,
+        zero_copy: bool = False
+    ) -> Tuple[Optional[Union[bytes, memoryview]], Dict]:
         """
-        Generate a custom document based on provided data.
-        This is a flexible method that can handle various custom document types.
+        Generate an Employment Agreement as PDF.
 
         Args:
-            data: Dictionary containing document information
-                - title: Document title (required)
-                - sections: List of sections, each with 'heading' and 'content'
-                - date: Document date (optional)
-                - parties: List of party names (optional)
-                - additional fields as needed
+            data: Dictionary containing employment information
+                - employee_name: Employee name
+                - company_name: Company name
+                - position: Job position
+                - start_date: Start date
+                - salary: Annual salary
             highlight_field: Optional field name to highlight
+            output: Optional binary stream to write the PDF into
+            zero_copy: Return the PDF as a memoryview instead of bytes
 
         Returns:
-            Tuple of (PDF bytes, document data dictionary)
+            Tuple of (PDF bytes or None if written to output, document data dictionary)
+        """
+        content_blocks, doc_data, title = DocumentService._build_employment_agreement_blocks(data, highlight_field)
+        return DocumentService._create_pdf(content_blocks, title, output, zero_copy), doc_data
+
+    @staticmethod
+    def _build_custom_document_blocks(data: Dict, highlight_field: Optional[str] = None) -> Tuple[Sequence[Block], Dict, str]:
+        """
+        Build the content blocks for a custom document.
+
+        Returns:
+            Tuple of (content blocks, document data dictionary, PDF title)
         """
         title = data.get('title', 'LEGAL DOCUMENT')
         raw_sections = data.get('sections', [])
@@ -432,64 +737,67 @@ class DocumentService:
         }
 
         content_blocks = [
-            (title.upper(), 'title', highlight_field == 'title'),
-            ("", 'normal'),
+            Block(_xml_escape(title.upper()), _TITLE_STYLE, highlight_field == 'title'),
+            _BLANK_BLOCK,
         ]
 
         if doc_date:
-            content_blocks.append((f"Date: {doc_date}", 'normal', highlight_field == 'date'))
-            content_blocks.append(("", 'normal'))
+            content_blocks.append(Block(f"Date: {_xml_escape(str(doc_date))}", _NORMAL_STYLE, highlight_field == 'date'))
+            content_blocks.append(_BLANK_BLOCK)
 
         # Add parties if provided
         if parties:
-            content_blocks.append(("PARTIES:", 'heading'))
-            content_blocks.append(("", 'normal'))
-            for party in parties:
-                content_blocks.append((party, 'normal', highlight_field == 'parties'))
-            content_blocks.append(("", 'normal'))
+            party_highlighted = highlight_field == 'parties'
+            content_blocks.extend((Block("PARTIES:", _HEADING_STYLE), _BLANK_BLOCK))
+            content_blocks.extend(Block(_xml_escape(party), _NORMAL_STYLE, party_highlighted) for party in parties)
+            content_blocks.append(_BLANK_BLOCK)
 
         # Add sections
-        for i, section in enumerate(sections, 1):
-            # Handle section as dict or string
-            if isinstance(section, dict):
-                heading = section.get('heading', f'Section {i}')
-                content = section.get('content', '')
-            else:
-                # Section is a string - use it as content with default heading
-                heading = f'Section {i}'
-                content = str(section)
-            
-            # Check if this section is being highlighted (by heading name)
-            is_highlighted = highlight_field == heading
-
-            content_blocks.append((f"{i}. {heading.upper()}", 'heading', is_highlighted))
-
-            # Handle content that might be a list or a string
-            if isinstance(content, list):
-                for item in content:
-                    content_blocks.append((str(item), 'bullet', is_highlighted))
-            else:
-                content_blocks.append((str(content), 'normal', is_highlighted))
-            content_blocks.append(("", 'normal'))
+        content_blocks.extend(chain.from_iterable(
+            _section_blocks(i, section, highlight_field)
+            for i, section in enumerate(sections, 1)
+        ))
 
         # Add signature lines
-        content_blocks.extend([
-            ("", 'normal'),
-            ("_________________________________", 'signature'),
-            ("Signature", 'signature'),
-            ("", 'normal'),
-            ("Date: _______________", 'signature'),
-        ])
+        content_blocks.extend(_CUSTOM_SIGNATURE_BLOCKS)
 
-        pdf_bytes = DocumentService._create_pdf(content_blocks, title)
-        return pdf_bytes, doc_data
+        return content_blocks, doc_data, title
+
+    @staticmethod
+    def generate_custom_document(
+        data: Dict,
+        highlight_field: Optional[str] = None,
+        output: Optional[BinaryIO] = None,
+        zero_copy: bool = False
+    ) -> Tuple[Optional[Union[bytes, memoryview]], Dict]:
+        """
+        Generate a custom document based on provided data.
+        This is a flexible method that can handle various custom document types.
+
+        Args:
+            data: Dictionary containing document information
+                - title: Document title (required)
+                - sections: List of sections, each with 'heading' and 'content'
+                - date: Document date (optional)
+                - parties: List of party names (optional)
+                - additional fields as needed
+            highlight_field: Optional field name to highlight
+            output: Optional binary stream to write the PDF into
+            zero_copy: Return the PDF as a memoryview instead of bytes
+
+        Returns:
+            Tuple of (PDF bytes or None if written to output, document data dictionary)
+        """
+        content_blocks, doc_data, title = DocumentService._build_custom_document_blocks(data, highlight_field)
+        return DocumentService._create_pdf(content_blocks, title, output, zero_copy), doc_data
 
     @staticmethod
     def apply_edit(
         doc_data: Dict,
         edit_type: str,
         field_name: str,
-        new_value: Any
+        new_value: Any,
+        copy_input: bool = True
     ) -> Tuple[bytes, bytes, Dict, str]:
         """
         Apply edits to a document and regenerate PDF.
@@ -499,73 +807,66 @@ class DocumentService:
             edit_type: Type of edit ('update_field', 'add_section', 'remove_section')
             field_name: Name of field to edit
             new_value: New value to apply
+            copy_input: Copy doc_data (and its sections list) before editing; pass
+                        False when the caller owns doc_data and it may be edited in place
 
         Returns:
             Tuple of (preview PDF bytes, download PDF bytes, updated doc_data, change_description)
+
+        Raises:
+            ValueError: If the edit type is unknown, the section to remove does not
+                        exist, or the document cannot be regenerated
         """
-        # Make a copy to avoid modifying the original
-        updated_data = doc_data.copy()
-        changes = []
-
-        if edit_type == 'update_field':
-            # Update a specific field
-            if field_name in updated_data:
-                old_value = updated_data[field_name]
-                updated_data[field_name] = new_value
-                changes.append(f"Updated {field_name} from '{old_value}' to '{new_value}'")
-            else:
-                # Add new field if it doesn't exist
-                updated_data[field_name] = new_value
-                changes.append(f"Added {field_name}: '{new_value}'")
-
-        elif edit_type == 'add_section':
-            # Add a new section (for custom documents)
-            if 'sections' not in updated_data:
-                updated_data['sections'] = []
-            updated_data['sections'].append({
-                'heading': field_name,
-                'content': new_value
-            })
-            changes.append(f"Added section: {field_name}")
-
-        elif edit_type == 'remove_section':
-            # Remove a section
-            if 'sections' in updated_data:
-                updated_data['sections'] = [
-                    s for s in updated_data['sections']
-                    if s.get('heading') != field_name
-                ]
-                changes.append(f"Removed section: {field_name}")
+        # Make a copy to avoid modifying the original, unless the caller opts out
+        updated_data = doc_data.copy() if copy_input else doc_data
+
+        edit = _EDITORS.get(edit_type)
+        if edit is None:
+            raise ValueError(f"Unsupported edit type: {edit_type}")
+        change_description = edit(updated_data, field_name, new_value, copy_input)
 
         # Regenerate the document based on type
         doc_type = updated_data.get('type', 'custom')
 
         try:
-            # Generate preview with highlights
-            if doc_type == 'director_appointment':
-                pdf_preview, _ = DocumentService.generate_director_appointment(updated_data, highlight_field=field_name)
-                pdf_download, updated_data = DocumentService.generate_director_appointment(updated_data, highlight_field=None)
-            elif doc_type == 'nda':
-                pdf_preview, _ = DocumentService.generate_nda(updated_data, highlight_field=field_name)
-                pdf_download, updated_data = DocumentService.generate_nda(updated_data, highlight_field=None)
-            elif doc_type == 'employment_agreement':
-                pdf_preview, _ = DocumentService.generate_employment_agreement(updated_data, highlight_field=field_name)
-                pdf_download, updated_data = DocumentService.generate_employment_agreement(updated_data, highlight_field=None)
-            elif doc_type == 'custom':
-                pdf_preview, _ = DocumentService.generate_custom_document(updated_data, highlight_field=field_name)
-                pdf_download, updated_data = DocumentService.generate_custom_document(updated_data, highlight_field=None)
-            else:
+            # Build the blocks once; the preview highlights the edited field
+            build = _BUILDERS.get(doc_type)
+            if build is None:
                 raise ValueError(f"Unsupported document type: {doc_type}")
 
-            change_description = '; '.join(changes) if changes else f"Updated {field_name}"
+            # Fields that no template block highlights render identically either way
+            highlightable = _HIGHLIGHTABLE_FIELDS.get(doc_type)
+            if highlightable is not None and field_name not in highlightable:
+                content_blocks, updated_data, title = build(updated_data, highlight_field=None)
+                pdf_preview = DocumentService._create_pdf(content_blocks, title)
+                return pdf_preview, pdf_preview, updated_data, change_description
+
+            content_blocks, updated_data, title = build(updated_data, highlight_field=field_name)
+            pdf_preview = DocumentService._create_pdf(content_blocks, title)
+
+            # The download version only needs its own render if anything was highlighted
+            if any(block.highlight for block in content_blocks):
+                pdf_download = DocumentService._create_pdf(
+                    [block._replace(highlight=False) for block in content_blocks],
+                    title
+                )
+            else:
+                pdf_download = pdf_preview
             return pdf_preview, pdf_download, updated_data, change_description
 
         except Exception as e:
             raise ValueError(
                 f"Error regenerating document of type '{doc_type}' during '{edit_type}' on field '{field_name}': {str(e)}"
             )
+
     @staticmethod
-    def generate(document_type: str, document_data: Dict, highlight_field: Optional[str] = None) -> Tuple[bytes, Dict]:
+    def generate(
+        document_type: str,
+        document_data: Dict,
+        highlight_field: Optional[str] = None,
+        output: Optional[BinaryIO] = None,
+        zero_copy: bool = False
+    ) -> Tuple[Optional[Union[bytes, memoryview]], Dict]:
         """
         Generate a document based on type.
 
@@ -573,21 +874,165 @@ class DocumentService:
             document_type: Type of document to generate
             document_data: Data for document generation
             highlight_field: Optional field name to highlight
+            output: Optional binary stream to write the PDF into
+            zero_copy: Return the PDF as a memoryview instead of bytes
 
         Returns:
-            Tuple of (PDF bytes, document data dictionary)
+            Tuple of (PDF bytes or None if written to output, document data dictionary)
 
         Raises:
             ValueError: If document type is not supported
         """
-        document_type_lower = document_type.lower()
-
-        if 'director' in document_type_lower or 'appointment' in document_type_lower:
-            return DocumentService.generate_director_appointment(document_data, highlight_field)
-        elif 'nda' in document_type_lower or 'non-disclosure' in document_type_lower:
-            return DocumentService.generate_nda(document_data, highlight_field)
-        elif 'employment' in document_type_lower:
-            return DocumentService.generate_employment_agreement(document_data, highlight_field)
-        else:
-            # Try to generate a custom document for unknown types
-            return DocumentService.generate_custom_document(document_data, highlight_field)
+        # Canonical names skip normalization entirely
+        generator = _GENERATORS.get(document_type) or _resolve_generator(document_type)
+        return generator(document_data, highlight_field, output, zero_copy)
+
+    @staticmethod
+    def generate_batch(
+        items: Iterable[Tuple[str, Dict]],
+        workers: Optional[int] = None
+    ) -> List[Union[bytes, Exception]]:
+        """
+        Generate many documents in parallel across processes.
+
+        ReportLab layout is pure Python and holds the GIL, so separate
+        processes are used rather than threads.
+
+        Args:
+            items: (document_type, document_data) pairs
+            workers: Number of worker processes (defaults to the CPU count)
+
+        Returns:
+            PDF bytes for each item in input order, or the exception raised
+            while generating that item
+        """
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            return list(executor.map(_generate_one, items))
+
+
+@lru_cache(maxsize=256)
+def _render_pdf_cached(content_blocks: tuple, title: str, fast: bool) -> bytes:
+    """Render content blocks to PDF bytes, memoized on the blocks, title and renderer."""
+    buffer = BytesIO()
+    DocumentService._render_pdf(content_blocks, title, buffer, fast)
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+def _generate_one(item: Tuple[str, Dict]) -> Union[bytes, Exception]:
+    """Generate a single batch item; module-level so worker processes can unpickle it."""
+    document_type, document_data = item
+    try:
+        pdf_bytes, _ = DocumentService.generate(document_type, document_data)
+        return pdf_bytes
+    except Exception as e:
+        return e
+
+
+def _update_field(data: Dict, field_name: str, new_value: Any, copy_input: bool) -> str:
+    """Set a field, adding it if it doesn't exist."""
+    if field_name in data:
+        old_value = data[field_name]
+        data[field_name] = new_value
+        return f"Updated {field_name} from '{old_value}' to '{new_value}'"
+    data[field_name] = new_value
+    return f"Added {field_name}: '{new_value}'"
+
+
+def _add_section(data: Dict, field_name: str, new_value: Any, copy_input: bool) -> str:
+    """Append a section (for custom documents), copying the sections list if requested."""
+    section = {
+        'heading': field_name,
+        'content': new_value
+    }
+    if copy_input:
+        data['sections'] = [*data.get('sections', ()), section]
+    else:
+        data.setdefault('sections', []).append(section)
+    return f"Added section: {field_name}"
+
+
+def _remove_section(data: Dict, field_name: str, new_value: Any, copy_input: bool) -> str:
+    """Remove every section with a matching heading, editing the sections list in place unless copying."""
+    sections = data.get('sections', ())
+    kept = [
+        s for s in sections
+        if not (isinstance(s, dict) and s.get('heading') == field_name)
+    ]
+    if len(kept) == len(sections):
+        # Nothing to remove, so don't re-render an unchanged document
+        raise ValueError(f"Section not found: {field_name}")
+    if copy_input:
+        data['sections'] = kept
+    else:
+        sections[:] = kept
+    return f"Removed section: {field_name}"
+
+
+# Edit type -> handler that edits doc_data in place and describes the change
+_EDITORS = {
+    'update_field': _update_field,
+    'add_section': _add_section,
+    'remove_section': _remove_section,
+}
+
+# Stored document type -> block builder, used to re-render after an edit
+_BUILDERS = {
+    'director_appointment': DocumentService._build_director_appointment_blocks,
+    'nda': DocumentService._build_nda_blocks,
+    'employment_agreement': DocumentService._build_employment_agreement_blocks,
+    'custom': DocumentService._build_custom_document_blocks,
+}
+
+# Canonical document type -> generator
+_GENERATORS = {
+    'director_appointment': DocumentService.generate_director_appointment,
+    'nda': DocumentService.generate_nda,
+    'non_disclosure_agreement': DocumentService.generate_nda,
+    'employment_agreement': DocumentService.generate_employment_agreement,
+    'custom': DocumentService.generate_custom_document,
+}
+
+# Common alternative names -> canonical type name
+_ALIASES = {
+    'director': 'director_appointment',
+    'appointment': 'director_appointment',
+    'director_appointment_resolution': 'director_appointment',
+    'non_disclosure': 'nda',
+    'employment': 'employment_agreement',
+    'employment_contract': 'employment_agreement',
+}
+
+# Keyword -> generator for other type names, checked in order
+_GENERATOR_KEYWORDS = (
+    ('director', DocumentService.generate_director_appointment),
+    ('appointment', DocumentService.generate_director_appointment),
+    ('nda', DocumentService.generate_nda),
+    ('non-disclosure', DocumentService.generate_nda),
+    ('employment', DocumentService.generate_employment_agreement),
+)
+
+
+@lru_cache(maxsize=128)
+def _resolve_generator(document_type: str):
+    """
+    Map a requested document type to its generator.
+
+    Canonical names and aliases resolve with one lookup; anything else falls
+    back to keyword matching and then to a custom document. The result is
+    cached, so repeated free-form type names skip the keyword scan.
+    """
+    document_type_lower = document_type.lower()
+    key = document_type_lower.replace('-', '_').replace(' ', '_')
+    generator = _GENERATORS.get(_ALIASES.get(key, key))
+    if generator is not None:
+        return generator
+
+    # Fall back to keyword matching for free-form type names
+    for keyword, keyword_generator in _GENERATOR_KEYWORDS:
+        if keyword in document_type_lower:
+            return keyword_generator
+
+    # Try to generate a custom document for unknown types
+    return DocumentService.generate_custom_document
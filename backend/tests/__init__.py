@@ -0,0 +1,10 @@
+"""
+Backend tests.
+
+Run from the backend directory with:
+    python -m unittest discover -s tests -t .
+"""
+import os
+
+# Config validation requires a key; the tests never call the real API
+os.environ.setdefault('GEMINI_API_KEY', 'test-key')
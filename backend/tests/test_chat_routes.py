@@ -0,0 +1,104 @@
+"""
+Tests for the PDF download route and gzip negotiation on /chat.
+"""
+import gzip
+import unittest
+from types import SimpleNamespace
+
+from app import app
+from routes import chat as chat_module
+from services import conversation_service
+
+
+class _FakeSession:
+    """Chat session that answers every message with one text chunk."""
+
+    def send_message(self, message, stream=False):
+        part = SimpleNamespace(function_call=None, text='Hello')
+        chunk = SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+        return iter([chunk])
+
+
+class _FakeModel:
+    def start_chat(self, history=None):
+        return _FakeSession()
+
+
+class DocumentPdfRouteTests(unittest.TestCase):
+    """Tests for GET /conversations/<id>/pdf/<version>."""
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.conversation_id = conversation_service.create_conversation()
+        self.version = conversation_service.set_document(
+            self.conversation_id, b'%PDF-download', {'type': 'nda'}, preview_bytes=b'%PDF-preview'
+        )
+
+    def tearDown(self):
+        conversation_service.delete_conversation(self.conversation_id)
+
+    def test_preview_is_default(self):
+        response = self.client.get(f'/conversations/{self.conversation_id}/pdf/{self.version}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/pdf')
+        self.assertEqual(response.data, b'%PDF-preview')
+
+    def test_download_variant(self):
+        response = self.client.get(
+            f'/conversations/{self.conversation_id}/pdf/{self.version}?variant=download'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b'%PDF-download')
+
+    def test_unknown_version_is_404(self):
+        response = self.client.get(f'/conversations/{self.conversation_id}/pdf/{self.version + 1}')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_conversation_is_404(self):
+        response = self.client.get(f'/conversations/missing/pdf/{self.version}')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class ChatGzipTests(unittest.TestCase):
+    """Tests for gzip negotiation on POST /chat."""
+
+    def setUp(self):
+        self.client = app.test_client()
+        self._model = chat_module._MODEL
+        chat_module._MODEL = _FakeModel()
+
+    def tearDown(self):
+        chat_module._MODEL = self._model
+
+    def _chat(self, accept_encoding):
+        return self.client.post(
+            '/chat',
+            json={'message': 'Hi'},
+            headers={'Accept-Encoding': accept_encoding}
+        )
+
+    def test_gzip_accepted(self):
+        response = self._chat('gzip')
+
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn(b'"type":"done"', gzip.decompress(response.get_data()))
+
+    def test_gzip_refused_with_zero_quality(self):
+        response = self._chat('gzip;q=0')
+
+        self.assertIsNone(response.headers.get('Content-Encoding'))
+        self.assertIn(b'"type":"done"', response.get_data())
+
+    def test_no_accept_encoding(self):
+        response = self._chat('identity')
+
+        self.assertIsNone(response.headers.get('Content-Encoding'))
+        self.assertIn(b'data: {"type":"text","content":"Hello"}', response.get_data())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Tests for DocumentService.apply_edit error paths and section removal.
+"""
+import unittest
+
+from services import DocumentService
+
+
+def _custom_document(*headings):
+    return {
+        'type': 'custom',
+        'title': 'Lease',
+        'sections': [{'heading': heading, 'content': 'Text'} for heading in headings],
+    }
+
+
+class ApplyEditTests(unittest.TestCase):
+    """Tests for DocumentService.apply_edit."""
+
+    def test_unknown_edit_type_raises(self):
+        with self.assertRaisesRegex(ValueError, 'Unsupported edit type: replace_section'):
+            DocumentService.apply_edit({'type': 'nda'}, 'replace_section', 'party1_name', 'Acme')
+
+    def test_remove_missing_section_raises(self):
+        with self.assertRaisesRegex(ValueError, 'Section not found: Rent'):
+            DocumentService.apply_edit(_custom_document('Term'), 'remove_section', 'Rent', '')
+
+    def test_remove_section_without_sections_raises(self):
+        with self.assertRaisesRegex(ValueError, 'Section not found: Rent'):
+            DocumentService.apply_edit({'type': 'nda'}, 'remove_section', 'Rent', '')
+
+    def test_remove_section_removes_every_match(self):
+        doc_data = _custom_document('Rent', 'Term', 'Rent')
+        _, _, updated, changes = DocumentService.apply_edit(doc_data, 'remove_section', 'Rent', '')
+
+        self.assertEqual([s['heading'] for s in updated['sections']], ['Term'])
+        self.assertEqual(changes, 'Removed section: Rent')
+        # The caller's data is left untouched by default
+        self.assertEqual(len(doc_data['sections']), 3)
+
+    def test_update_field_renders_pdfs(self):
+        preview, download, updated, changes = DocumentService.apply_edit(
+            {'type': 'nda', 'party1_name': 'Acme'}, 'update_field', 'party1_name', 'Beta'
+        )
+
+        self.assertTrue(preview.startswith(b'%PDF'))
+        self.assertTrue(download.startswith(b'%PDF'))
+        self.assertEqual(updated['party1_name'], 'Beta')
+        self.assertEqual(changes, "Updated party1_name from 'Acme' to 'Beta'")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 """
 Utilities package for helper functions.
 """
-from .streaming import create_sse_response
+from .streaming import create_sse_response, sse_text, sse_done, sse_error, gzip_stream, threaded_stream
 
-__all__ = ['create_sse_response']
+__all__ = ['create_sse_response', 'sse_text', 'sse_done', 'sse_error', 'gzip_stream', 'threaded_stream']
@@ -1,11 +1,31 @@
 """
 SSE streaming utilities.
 """
-import json
-from typing import Dict, Any
+import queue
+import threading
+import zlib
+from concurrent.futures import Executor
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Any, Iterable, Iterator
 
+import orjson
 
-def create_sse_response(event_type: str, data: Dict[str, Any]) -> str:
+# Constant framing for text events, equivalent to create_sse_response('text', ...)
+_TEXT_PREFIX = b'data: {"type":"text","content":'
+_FRAME_SUFFIX = b'}\n\n'
+
+# Constant framing for the done and error events
+_DONE_PREFIX = b'data: {"type":"done","conversation_id":'
+_ERROR_PREFIX = b'data: {"type":"error","content":'
+
+# Bound once so each event skips the module attribute lookup
+_dumps = orjson.dumps
+
+# Marks the end of a threaded stream
+_END_OF_STREAM = object()
+
+
+def create_sse_response(event_type: str, data: Dict[str, Any]) -> bytes:
     """
     Create a formatted SSE response.
 
@@ -14,18 +34,180 @@ def create_sse_response(event_type: str, data: Dict[str, Any]) -> str:
         data: Additional data for the event
 
     Returns:
-        Formatted SSE message
+        Formatted SSE message as UTF-8 bytes
 
     Raises:
         TypeError: If data contains non-JSON-serializable objects
     """
     payload = {'type': event_type, **data}
     try:
-        return f"data: {json.dumps(payload)}\n\n"
+        return b"data: %s\n\n" % _dumps(payload)
     except TypeError as e:
         # Log the error with details about what failed to serialize
         error_msg = f"Failed to serialize SSE payload: {e}. Event type: {event_type}"
         print(f"ERROR: {error_msg}")
         # Return an error event instead
         error_payload = {'type': 'error', 'content': error_msg}
-        return f"data: {json.dumps(error_payload)}\n\n"
+        return b"data: %s\n\n" % _dumps(error_payload)
+
+
+def sse_text(content: str) -> bytes:
+    """
+    Create a formatted SSE text event.
+
+    Fast path for the per-token stream: the content string is escaped by
+    the C string encoder from the json module, and the surrounding frame
+    is a precomputed constant, so no payload object is built.
+
+    Args:
+        content: Text chunk to send
+
+    Returns:
+        Formatted SSE message as UTF-8 bytes
+    """
+    return _TEXT_PREFIX + encode_basestring_ascii(content).encode('ascii') + _FRAME_SUFFIX
+
+
+def sse_done(conversation_id: str) -> bytes:
+    """
+    Create a formatted SSE done event.
+
+    Args:
+        conversation_id: Conversation ID the turn belongs to
+
+    Returns:
+        Formatted SSE message as UTF-8 bytes
+    """
+    return _DONE_PREFIX + encode_basestring_ascii(conversation_id).encode('ascii') + _FRAME_SUFFIX
+
+
+def sse_error(content: str) -> bytes:
+    """
+    Create a formatted SSE error event.
+
+    Args:
+        content: Error message to send
+
+    Returns:
+        Formatted SSE message as UTF-8 bytes
+    """
+    return _ERROR_PREFIX + encode_basestring_ascii(content).encode('ascii') + _FRAME_SUFFIX
+
+
+def gzip_stream(frames: Iterable[bytes], level: int = 1) -> Iterator[bytes]:
+    """
+    Gzip-compress an SSE stream frame by frame.
+
+    Each frame is sync-flushed so the client can decode and dispatch it
+    immediately; a low compression level keeps per-frame CPU small.
+
+    Args:
+        frames: Iterable of SSE messages
+        level: zlib compression level
+
+    Yields:
+        Compressed chunks forming a single gzip stream
+    """
+    # wbits=31 selects the gzip container format
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for frame in frames:
+        yield compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def threaded_stream(
+    frames: Iterable[bytes],
+    executor: Executor,
+    maxsize: int = 64,
+    poll_interval: float = 0.5,
+    max_batch_bytes: int = 65536,
+    start_timeout: float = 30.0
+) -> Iterator[bytes]:
+    """
+    Produce an SSE stream on a worker thread and drain it through a bounded queue.
+
+    The frames iterable (model calls, parsing, encoding) runs on the executor
+    while the calling thread only writes finished frames to the socket. The
+    bounded queue applies backpressure to the producer; if the client goes
+    away, the producer stops at its next put and the frames iterable is closed.
+    Frames that are already queued when the calling thread wakes up are
+    joined into one chunk, so a burst costs one socket write instead of one
+    per frame; a lone frame is still sent as soon as it arrives.
+
+    If no worker picks the producer up within start_timeout, or the producer
+    raises, the error is logged and the stream ends with an SSE error event.
+
+    Args:
+        frames: Iterable of SSE messages to run on the worker thread
+        executor: Executor the producer is submitted to
+        maxsize: Maximum number of frames buffered between the threads
+        poll_interval: Seconds a blocked producer waits before rechecking for cancellation
+        max_batch_bytes: Size at which a batch of queued frames is sent without draining further
+        start_timeout: Seconds to wait for a free worker before giving up
+
+    Yields:
+        One or more SSE messages per chunk, in the order the producer emitted them
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    cancelled = threading.Event()
+    started = threading.Event()
+    errors = []
+
+    def put(item) -> bool:
+        while not cancelled.is_set():
+            try:
+                buffer.put(item, timeout=poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        started.set()
+        iterator = iter(frames)
+        try:
+            for frame in iterator:
+                if not put(frame):
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+            put(_END_OF_STREAM)
+
+    future = executor.submit(produce)
+    if not started.wait(start_timeout) and future.cancel():
+        print(f"ERROR: No stream worker became free within {start_timeout}s")
+        yield sse_error("The server is busy. Please try again shortly.")
+        return
+
+    try:
+        finished = False
+        while not finished:
+            frame = buffer.get()
+            if frame is _END_OF_STREAM:
+                break
+
+            # Send whatever else is already waiting in the same write
+            batch = [frame]
+            size = len(frame)
+            while size < max_batch_bytes:
+                try:
+                    frame = buffer.get_nowait()
+                except queue.Empty:
+                    break
+                if frame is _END_OF_STREAM:
+                    finished = True
+                    break
+                batch.append(frame)
+                size += len(frame)
+
+            yield batch[0] if len(batch) == 1 else b''.join(batch)
+
+        if errors:
+            print(f"ERROR: Stream producer failed: {errors[0]!r}")
+            yield sse_error(f"Stream failed: {errors[0]}")
+    finally:
+        cancelled.set()
@@ -194,8 +194,8 @@ export default function ChatInterface({ onDocumentUpdate, onDocumentChanges, onR
                 updateMessageContent(assistantMessageId, streamingTextRef.current)
 
               } else if (data.type === 'document') {
-                // Handle PDF document (base64 encoded)
-                onDocumentUpdate(data.pdf_base64, data.pdf_base64_download)
+                // Handle PDF document (served by URL, fetched by the preview)
+                onDocumentUpdate(`${API_URL}${data.pdf_url}`, `${API_URL}${data.pdf_download_url}`)
                 if (data.changes) {
                   onDocumentChanges(data.changes)
                 }
@@ -1,73 +1,43 @@
 'use client'
 
-import { useEffect, useState, useRef } from 'react'
+import { useEffect, useState } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { FileText, Download, AlertCircle } from 'lucide-react'
 import { cn } from '@/lib/utils'
 
 interface DocumentPreviewProps {
-  document: string | null  // base64 encoded PDF (preview)
-  documentDownload?: string | null // base64 encoded PDF (download)
+  document: string | null  // URL of the PDF (preview)
+  documentDownload?: string | null // URL of the PDF (download)
   changes: string | null
 }
 
 export default function DocumentPreview({ document, documentDownload, changes }: DocumentPreviewProps) {
-  const [pdfUrl, setPdfUrl] = useState<string | null>(null)
   const [showChanges, setShowChanges] = useState(false)
-  const currentUrlRef = useRef<string | null>(null)
 
-  useEffect(() => {
-    // Clean up previous URL
-    if (currentUrlRef.current) {
-      URL.revokeObjectURL(currentUrlRef.current)
-      currentUrlRef.current = null
-    }
+  // The backend serves each document version at its own URL, so the
+  // viewer can load it directly
+  const pdfUrl = document
 
-    if (document) {
-      // Convert base64 to blob and create URL
-      try {
-        const binaryString = atob(document)
-        const bytes = Uint8Array.from(binaryString, c => c.charCodeAt(0))
-        const blob = new Blob([bytes], { type: 'application/pdf' })
-        const url = URL.createObjectURL(blob)
-        currentUrlRef.current = url
-        setPdfUrl(url)
-      } catch (error) {
-        console.error('Error converting PDF:', error)
-        setPdfUrl(null)
-      }
-
-      // Show changes notification if there are changes
-      if (changes) {
-        setShowChanges(true)
-        const timeoutId = setTimeout(() => setShowChanges(false), 3000)
-        return () => clearTimeout(timeoutId)
-      }
-    } else {
-      setPdfUrl(null)
-    }
-
-    // Cleanup function
-    return () => {
-      if (currentUrlRef.current) {
-        URL.revokeObjectURL(currentUrlRef.current)
-        currentUrlRef.current = null
-      }
+  useEffect(() => {
+    // Show changes notification if there are changes
+    if (document && changes) {
+      setShowChanges(true)
+      const timeoutId = setTimeout(() => setShowChanges(false), 3000)
+      return () => clearTimeout(timeoutId)
     }
   }, [document, changes])
 
-  const handleDownload = () => {
+  const handleDownload = async () => {
     const docToDownload = documentDownload || document
     if (!docToDownload) return
 
     try {
-      // Convert base64 to blob
-      const binaryString = atob(docToDownload)
-      const bytes = new Uint8Array(binaryString.length)
-      for (let i = 0; i < binaryString.length; i++) {
-        bytes[i] = binaryString.charCodeAt(i)
+      // Fetch the PDF as a blob (the download attribute is ignored cross-origin)
+      const response = await fetch(docToDownload)
+      if (!response.ok) {
+        throw new Error('Failed to fetch PDF')
       }
-      const blob = new Blob([bytes], { type: 'application/pdf' })
+      const blob = await response.blob()
 
       // Create download link
       const url = URL.createObjectURL(blob)